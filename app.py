@@ -13,6 +13,7 @@
 # 디렉토리 구조:
 # wafer_analysis/
 # ├── app.py
+# ├── core.py
 # ├── i18n.py
 # ├── folder_picker_helper.py
 # └── modules/
@@ -29,14 +30,32 @@ import os
 import platform
 import subprocess
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 # ── 외부 라이브러리 ────────────────────────────────────────────────────────────
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
-from scipy.interpolate import griddata
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# ── 핵심 함수 (core.py) ────────────────────────────────────────────────────────
+# 순수 계산/시각화 함수는 core.py에 정의 → app.py는 UI 로직만 담당
+from core import (
+    DatasetStore,
+    _default_col_index,
+    apply_col_mapping,
+    blob_fingerprint,
+    blob_to_df,
+    calculate_stats,
+    create_2d_heatmap,
+    create_3d_surface,
+    create_contour_map,
+    create_line_scan,
+    df_to_blob,
+    get_sheet_names,
+    get_wafer_grid,
+    load_file_cached,
+)
 
 # ── i18n 모듈 ──────────────────────────────────────────────────────────────────
 # [요청 4] 다국어 지원
@@ -249,292 +268,10 @@ def file_upload_dialog() -> None:
         st.rerun()
 
 
-# =============================================================================
-# [3] 데이터 처리 함수
-# =============================================================================
-
-@st.cache_data
-def load_file_cached(full_path: str, sheet_name=None) -> pd.DataFrame:
-    """CSV/Excel 파일 로드 (캐시 적용)."""
-    if full_path.lower().endswith(".csv"):
-        return pd.read_csv(full_path)
-    effective_sheet = 0 if sheet_name is None else sheet_name
-    return pd.read_excel(full_path, sheet_name=effective_sheet)
-
-
-@st.cache_data
-def get_sheet_names(full_path: str) -> list:
-    """Excel 시트 목록 반환 (CSV는 빈 리스트)."""
-    if full_path.lower().endswith(".csv"):
-        return []
-    try:
-        with pd.ExcelFile(full_path) as xf:
-            return xf.sheet_names
-    except Exception:
-        return []
-
-
-@st.cache_data
-def get_wafer_grid(df_json: str, resolution: int):
-    """불규칙 산점(x,y,z) → 균일 그리드(XI, YI, ZI) 보간."""
-    df = pd.read_json(df_json)
-    x, y, z = df["x"].values, df["y"].values, df["data"].values
-
-    radius = np.sqrt(x**2 + y**2).max()
-
-    xi = np.linspace(-radius, radius, resolution)
-    yi = np.linspace(-radius, radius, resolution)
-    XI, YI = np.meshgrid(xi, yi)
-
-    try:
-        ZI = griddata((x, y), z, (XI, YI), method="linear")
-    except Exception:
-        try:
-            ZI = griddata((x, y), z, (XI, YI), method="nearest")
-        except Exception:
-            ZI = np.full_like(XI, np.nan)
-
-    ZI[XI**2 + YI**2 > radius**2] = np.nan
-
-    return XI, YI, ZI, radius
-
-
-def add_wafer_outline(fig: go.Figure, radius: float) -> None:
-    """웨이퍼 원형 테두리 + Notch 추가."""
-    theta = np.linspace(0, 2 * np.pi, 360)
-    fig.add_trace(go.Scatter(
-        x=radius * np.cos(theta),
-        y=radius * np.sin(theta),
-        mode="lines",
-        line=dict(color="black", width=2),
-        showlegend=False,
-        hoverinfo="skip"
-    ))
-
-    nt = np.linspace(np.pi, 2 * np.pi, 60)
-    nr = radius * 0.03
-    fig.add_trace(go.Scatter(
-        x=nr * np.cos(nt),
-        y=-radius + nr * np.sin(nt),
-        mode="lines",
-        line=dict(color="black", width=2),
-        fill="toself",
-        fillcolor="white",
-        showlegend=False,
-        hoverinfo="skip"
-    ))
-
-
-def _wafer_layout(radius: float, height: int) -> dict:
-    """반복 사용되는 공통 레이아웃 설정."""
-    return dict(
-        xaxis=dict(
-            scaleanchor="y",
-            showgrid=False,
-            zeroline=False,
-            range=[-radius * 1.15, radius * 1.15]
-        ),
-        yaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            range=[-radius * 1.2, radius * 1.15]
-        ),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        height=height,
-        margin=dict(l=35, r=15, t=10, b=35)
-    )
-
-
-@st.cache_data
-def create_2d_heatmap(df_json: str, resolution: int, colorscale: str,
-                      show_points: bool, compact: bool = False,
-                      zmin=None, zmax=None) -> go.Figure:
-    """2D Heatmap 생성."""
-    df = pd.read_json(df_json)
-    x, y = df["x"].values, df["y"].values
-    XI, YI, ZI, radius = get_wafer_grid(df_json, resolution)
-    height = 300 if compact else 460
-
-    fig = go.Figure()
-    fig.add_trace(go.Heatmap(
-        x=XI[0],
-        y=YI[:, 0],
-        z=ZI,
-        colorscale=colorscale,
-        zsmooth="best",
-        zmin=zmin,
-        zmax=zmax,
-        colorbar=dict(thickness=10 if compact else 14, len=0.75),
-        connectgaps=False
-    ))
-    add_wafer_outline(fig, radius)
-
-    if show_points:
-        fig.add_trace(go.Scatter(
-            x=x, y=y, mode="markers",
-            marker=dict(size=3 if compact else 4, color="black", opacity=0.5),
-            showlegend=False
-        ))
-
-    fig.update_layout(**_wafer_layout(radius, height))
-    return fig
-
-
-@st.cache_data
-def create_contour_map(df_json: str, resolution: int, colorscale: str,
-                       n_contours: int, show_points: bool,
-                       compact: bool = False,
-                       zmin=None, zmax=None) -> go.Figure:
-    """Contour 맵 생성."""
-    df = pd.read_json(df_json)
-    x, y = df["x"].values, df["y"].values
-    XI, YI, ZI, radius = get_wafer_grid(df_json, resolution)
-    height = 300 if compact else 460
-
-    fig = go.Figure()
-    fig.add_trace(go.Contour(
-        x=XI[0], y=YI[:, 0], z=ZI,
-        colorscale=colorscale,
-        ncontours=n_contours,
-        contours=dict(coloring="heatmap", showlines=True),
-        line=dict(width=0.8, color="rgba(0,0,0,0.6)"),
-        zmin=zmin, zmax=zmax,
-        colorbar=dict(
-            thickness=10 if compact else 14,
-            len=0.75 if compact else 0.85
-        ),
-        connectgaps=False
-    ))
-    add_wafer_outline(fig, radius)
-
-    if show_points:
-        fig.add_trace(go.Scatter(
-            x=x, y=y, mode="markers",
-            marker=dict(size=3 if compact else 4, color="black", opacity=0.5),
-            showlegend=False
-        ))
-
-    fig.update_layout(**_wafer_layout(radius, height))
-    return fig
-
-
-@st.cache_data
-def create_3d_surface(df_json: str, resolution: int,
-                      colorscale: str) -> go.Figure:
-    """3D Surface 맵 생성."""
-    XI, YI, ZI, _ = get_wafer_grid(df_json, resolution)
-    fig = go.Figure(data=go.Surface(
-        x=XI, y=YI, z=ZI,
-        colorscale=colorscale,
-        colorbar=dict(title="Value", thickness=14)
-    ))
-    fig.update_layout(
-        title=dict(text="3D Surface", x=0.5),
-        scene=dict(
-            xaxis_title="X (mm)",
-            yaxis_title="Y (mm)",
-            zaxis_title="Data",
-            bgcolor="white",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.2))
-        ),
-        paper_bgcolor="white",
-        height=400,
-        margin=dict(l=20, r=20, t=50, b=20)
-    )
-    return fig
-
-
-@st.cache_data
-def create_line_scan(df_json: str, angle_deg: int,
-                     resolution: int) -> go.Figure:
-    """특정 각도 방향 단면 프로파일 (Line Scan)."""
-    df = pd.read_json(df_json)
-    x, y, z   = df["x"].values, df["y"].values, df["data"].values
-    radius    = np.sqrt(x**2 + y**2).max()
-    angle_rad = np.deg2rad(angle_deg)
-
-    positions = np.linspace(-radius, radius, resolution)
-    px = positions * np.cos(angle_rad)
-    py = positions * np.sin(angle_rad)
-
-    profile = griddata((x, y), z, (px, py), method="linear")
-    profile[~(px**2 + py**2 <= radius**2)] = np.nan
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=positions, y=profile,
-        mode="lines+markers",
-        line=dict(color="royalblue", width=2),
-        marker=dict(size=4, color="royalblue")
-    ))
-    fig.add_vline(x=0, line_dash="dash", line_color="gray", line_width=1)
-    fig.update_layout(
-        title=dict(text=f"Line Scan — {angle_deg}°", x=0.5),
-        xaxis=dict(title="Position (mm)", showgrid=True, gridcolor="lightgrey"),
-        yaxis=dict(title="Data", showgrid=True, gridcolor="lightgrey"),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        height=380,
-        margin=dict(l=60, r=20, t=50, b=50)
-    )
-    return fig
-
-
-@st.cache_data
-def calculate_stats(df_json: str) -> dict:
-    """측정 데이터 통계 계산."""
-    df   = pd.read_json(df_json)
-    d    = df["data"].dropna()
-    mean = d.mean()
-    std  = d.std()
-    d_max = d.max()
-    d_min = d.min()
-    return {
-        "Mean":           round(mean, 4),
-        "Maximum":        round(d_max, 4),
-        "Minimum":        round(d_min, 4),
-        "Std Dev":        round(std, 4),
-        "Uniformity (%)": round((std / mean) * 100, 4) if mean != 0 else 0.0,
-        "Range":          round(d_max - d_min, 4),
-        "No. Sites":      int(len(d))
-    }
-
-
-def apply_col_mapping(df_raw: pd.DataFrame,
-                      x_col: str, y_col: str, data_col: str) -> pd.DataFrame:
-    """사용자가 선택한 컬럼명 → 내부 표준명(x, y, data)으로 통일."""
-    all_cols = df_raw.columns.tolist()
-    # [요청 5] 에러 핸들링 개선: 컬럼 존재 확인
-    for col_name, col_val in [("X", x_col), ("Y", y_col), ("Data", data_col)]:
-        if col_val not in all_cols:
-            raise ValueError(f"{col_name} column '{col_val}' not found in data")
-    x_idx    = all_cols.index(x_col)
-    y_idx    = all_cols.index(y_col)
-    data_idx = all_cols.index(data_col)
-
-    return (
-        pd.DataFrame({
-            "x":    df_raw.iloc[:, x_idx].values,
-            "y":    df_raw.iloc[:, y_idx].values,
-            "data": df_raw.iloc[:, data_idx].values,
-        })
-        .dropna()
-        .reset_index(drop=True)
-    )
-
-
 # =============================================================================
 # [4] UI 헬퍼 함수
 # =============================================================================
 
-def _default_col_index(columns: list, name: str, fallback: int) -> int:
-    """컬럼 기본값 탐색 헬퍼."""
-    if name in columns:
-        return columns.index(name)
-    return min(fallback, len(columns) - 1)
-
-
 def wafer_title_banner(fname: str, prefix: str = "") -> None:
     """편집 가능한 파란 제목 배너."""
     key = f"title_{prefix}{fname}"
@@ -561,14 +298,23 @@ def wafer_title_banner(fname: str, prefix: str = "") -> None:
 # [5] 비교 모드 헬퍼 (웨이퍼 맵 탭 내부에서 사용)
 # =============================================================================
 
-def dataset_id() -> str:
-    """데이터셋 고유 ID 생성."""
-    return f"ds_{time.time_ns()}"
+def _dataset_store() -> DatasetStore:
+    """비교 모드 데이터셋 저장소 (session_state, 최초 1회 생성)."""
+    if "wm_datasets" not in st.session_state:
+        st.session_state.wm_datasets = DatasetStore()
+    return st.session_state.wm_datasets
+
+
+def _dataset_zrange(ds: dict):
+    """데이터셋 data 범위 (zmin, zmax). DatasetStore.append 시 저장된 값. NaN이면 None."""
+    if np.isnan(ds["zmin"]) or np.isnan(ds["zmax"]):
+        return None
+    return ds["zmin"], ds["zmax"]
 
 
 def _render_compare_dataset_manager() -> None:
     """비교 서브탭: 등록된 데이터셋 목록 + 순서 변경(▲/▼) + 삭제(✕)."""
-    datasets = st.session_state.get("wm_datasets", [])
+    datasets = _dataset_store()
     if not datasets:
         return
 
@@ -586,23 +332,25 @@ def _render_compare_dataset_manager() -> None:
         )
 
         if c_up.button("▲", key=f"cmpup_{ds_id}", disabled=(i == 0)):
-            datasets[i], datasets[i-1] = datasets[i-1], datasets[i]
-            st.session_state.wm_datasets = datasets
+            datasets.move(i, i - 1)
             st.rerun()
 
         if c_dn.button("▼", key=f"cmpdn_{ds_id}", disabled=(i == len(datasets)-1)):
-            datasets[i], datasets[i+1] = datasets[i+1], datasets[i]
-            st.session_state.wm_datasets = datasets
+            datasets.move(i, i + 1)
             st.rerun()
 
         if c_del.button("✕", key=f"cmpdel_{ds_id}"):
-            st.session_state.wm_datasets.pop(i)
+            datasets.pop(i)
+            # id = 내용 fp → 같은 데이터 재추가 시 이전 제목/편집본이 남지 않도록 정리
+            for k in (f"cmp_title_{ds_id}", f"cmp_edited_{ds_id}"):
+                st.session_state.pop(k, None)
             st.rerun()
 
 
 def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
     """비교 서브탭: 파일 또는 수동 입력으로 데이터셋 추가."""
-    with st.expander(t("compare_add_expander"), expanded=(len(st.session_state.get("wm_datasets", [])) < 2)):
+    datasets = _dataset_store()
+    with st.expander(t("compare_add_expander"), expanded=(len(datasets) < 2)):
 
         add_file_tab, add_manual_tab = st.tabs([t("compare_from_file"), t("compare_manual_input")])
 
@@ -678,7 +426,7 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
                     on_change=lambda: st.session_state.update({_user_edited_key: True})
                 )
 
-                existing_names = [d.get("name") for d in st.session_state.get("wm_datasets", [])]
+                existing_names = datasets.names()
                 btn_disabled = ds_name in existing_names
                 if btn_disabled:
                     st.warning(t("compare_name_exists", ds_name))
@@ -688,19 +436,14 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
                     try:
                         with st.spinner("..."):
                             df_mapped = apply_col_mapping(df_preview, x_col, y_col, data_col)
-                        new_ds = {
-                            "id":       dataset_id(),
-                            "name":     ds_name,
-                            "file":     full_path,
-                            "sheet":    sel_sheet,
-                            "x_col":    x_col,
-                            "y_col":    y_col,
-                            "data_col": data_col,
-                            "df_json":  df_mapped.to_json(),
-                        }
-                        if "wm_datasets" not in st.session_state:
-                            st.session_state.wm_datasets = []
-                        st.session_state.wm_datasets.append(new_ds)
+                            datasets.append({
+                                "name":     ds_name,
+                                "file":     full_path,
+                                "sheet":    sel_sheet,
+                                "x_col":    x_col,
+                                "y_col":    y_col,
+                                "data_col": data_col,
+                            }, df_mapped)
                         # [요청 2] 추가 후 자동이름 플래그 초기화
                         st.session_state[_user_edited_key] = False
                         st.success(t("compare_add_success", ds_name))
@@ -714,7 +457,7 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
 
             manual_name = st.text_input(
                 t("compare_ds_name"),
-                value=t("compare_manual_ds_name", len(st.session_state.get('wm_datasets', [])) + 1),
+                value=t("compare_manual_ds_name", len(datasets) + 1),
                 key="cmp_manual_name",
             )
 
@@ -749,7 +492,7 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
             else:
                 st.info(t("compare_manual_hint"))
 
-            existing_names = [d.get("name") for d in st.session_state.get("wm_datasets", [])]
+            existing_names = datasets.names()
             name_dup = manual_name in existing_names
             if name_dup:
                 st.warning(t("compare_name_exists", manual_name))
@@ -762,19 +505,14 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
                     disabled=(n_valid < 3 or name_dup),
                     use_container_width=True,
                 ):
-                    new_ds = {
-                        "id":       dataset_id(),
+                    datasets.append({
                         "name":     manual_name,
                         "file":     None,
                         "sheet":    None,
                         "x_col":    "x",
                         "y_col":    "y",
                         "data_col": "data",
-                        "df_json":  df_valid.to_json(),
-                    }
-                    if "wm_datasets" not in st.session_state:
-                        st.session_state.wm_datasets = []
-                    st.session_state.wm_datasets.append(new_ds)
+                    }, df_valid)
                     st.session_state[_CMP_MANUAL_KEY] = pd.DataFrame({
                         "x": [None] * 10, "y": [None] * 10, "data": [None] * 10,
                     })
@@ -788,10 +526,68 @@ def _render_compare_dataset_adder(file_names: list, data_folder: str) -> None:
                     })
                     st.rerun()
 
-def _render_compare_card(ds: dict, resolution: int, colorscale: str,
-                         n_contours: int, show_points: bool,
-                         global_zmin, global_zmax) -> None:
-    """비교 서브탭: 데이터셋 1개를 카드로 렌더링 (Heatmap + Contour + 통계)."""
+# 비교 카드 Figure 계산 병렬 스레드 상한
+_CMP_MAX_WORKERS = 8
+
+# st.fragment: Streamlit 1.37+ (이전 버전은 experimental_fragment, 둘 다 없으면 일반 함수)
+_st_fragment = (getattr(st, "fragment", None)
+                or getattr(st, "experimental_fragment", None)
+                or (lambda f: f))
+
+
+def _compute_compare_payload(ds: dict, df_cols: tuple, resolution: int, colorscale: str,
+                             n_contours: int, show_points: bool,
+                             global_zmin, global_zmax) -> dict:
+    """
+    비교 카드 1개의 계산 부분 (Heatmap/Contour Figure + 통계). st.* 렌더링 없음.
+    워커 스레드에서 실행 → 예외는 payload["error"]로 전달해 메인 스레드에서 표시.
+    """
+    try:
+        df_fp = ds["fp"]
+        return {
+            "fig_hm": create_2d_heatmap(
+                df_cols, resolution, colorscale, show_points,
+                compact=True, zmin=global_zmin, zmax=global_zmax, fp=df_fp
+            ),
+            "fig_ct": create_contour_map(
+                df_cols, resolution, colorscale, n_contours, show_points,
+                compact=True, zmin=global_zmin, zmax=global_zmax, fp=df_fp
+            ),
+            "stats": calculate_stats(df_cols, df_fp),
+        }
+    except Exception as e:
+        return {"error": e}
+
+
+def _compute_compare_payloads(datasets: DatasetStore, *args) -> list:
+    """
+    전 데이터셋 payload를 ThreadPoolExecutor로 병렬 계산 (결과는 데이터셋 순서 유지).
+
+    [설계 결정 근거]
+    - 보간(numpy/scipy/numba)은 GIL 해제 구간이 대부분 → 카드 간 병렬화 효과
+    - Streamlit 요소 생성은 스크립트 스레드 전용 → 워커는 계산만, 렌더링은 호출부에서 순차
+    - 워커에 ScriptRunContext 부착 → st.cache_data/resource가 세션 캐시를 그대로 사용
+    """
+    ctx = get_script_run_ctx()
+
+    def _job(i):
+        add_script_run_ctx(ctx=ctx)
+        return _compute_compare_payload(datasets[i], datasets.columns(i), *args)
+
+    with ThreadPoolExecutor(max_workers=min(_CMP_MAX_WORKERS, len(datasets))) as pool:
+        return list(pool.map(_job, range(len(datasets))))
+
+
+@_st_fragment
+def _render_compare_card(ds: dict, df_cols: tuple, payload: dict) -> None:
+    """
+    비교 서브탭: 데이터셋 1개를 카드로 렌더링 (Heatmap + Contour + 통계).
+    df_cols: DatasetStore.columns(i) → (x, y, data) 풀 view
+    payload: _compute_compare_payload 결과
+
+    fragment: 카드 안 위젯(제목 입력, Raw Data 편집) 조작 시 이 카드만 재실행
+    → 다른 카드/데이터셋 처리·전체 스크립트 rerun 없음 (인자는 최초 호출 값 재사용)
+    """
     ds_id = ds["id"]
 
     # 제목 배너
@@ -812,40 +608,30 @@ def _render_compare_card(ds: dict, resolution: int, colorscale: str,
     )
 
     try:
-        if "df_json" in ds and ds["df_json"]:
-            df_json = ds["df_json"]
-        else:
-            df_raw = load_file_cached(ds["file"], ds["sheet"])
-            df_mapped = apply_col_mapping(
-                df_raw, ds["x_col"], ds["y_col"], ds["data_col"]
-            )
-            df_json = df_mapped.to_json()
+        if "error" in payload:
+            raise payload["error"]
 
         # Heatmap
-        fig_hm = create_2d_heatmap(
-            df_json, resolution, colorscale, show_points,
-            compact=True, zmin=global_zmin, zmax=global_zmax
-        )
-        st.plotly_chart(fig_hm, use_container_width=True, key=f"cmp_hm_{ds_id}")
+        st.plotly_chart(payload["fig_hm"], use_container_width=True, key=f"cmp_hm_{ds_id}")
 
         # Contour
-        fig_ct = create_contour_map(
-            df_json, resolution, colorscale, n_contours, show_points,
-            compact=True, zmin=global_zmin, zmax=global_zmax
-        )
-        st.plotly_chart(fig_ct, use_container_width=True, key=f"cmp_ct_{ds_id}")
+        st.plotly_chart(payload["fig_ct"], use_container_width=True, key=f"cmp_ct_{ds_id}")
 
         # 통계
-        stats = calculate_stats(df_json)
-        stats_df = pd.DataFrame.from_dict(stats, orient="index", columns=["값" if get_lang() == "ko" else "Value"])
-        stats_df.index.name = "항목" if get_lang() == "ko" else "Metric"
+        # dict → 컬럼 1개 + 이름 있는 Index로 직접 구성 (from_dict orient="index" 변환 생략)
+        stats = payload["stats"]
+        is_ko = get_lang() == "ko"
+        stats_df = pd.DataFrame(
+            {"값" if is_ko else "Value": list(stats.values())},
+            index=pd.Index(list(stats), name="항목" if is_ko else "Metric"),
+        )
         st.dataframe(stats_df, use_container_width=True)
 
         # Raw Data (접힘)
         # [요청 3] 비교 카드에서도 편집 가능한 data_editor 사용
         with st.expander(t("compare_raw_data"), expanded=False):
             _edit_key = f"cmp_edited_{ds_id}"
-            df_disp = pd.read_json(df_json)
+            df_disp = blob_to_df(df_cols)
 
             edited_cmp = st.data_editor(
                 st.session_state.get(_edit_key, df_disp),
@@ -879,8 +665,8 @@ def _check_module_available(available: bool, module_name: str) -> bool:
 
 
 def _check_shared_data() -> bool:
-    """shared_df_json이 None이면 로드 안내 메시지 표시."""
-    if st.session_state.get("shared_df_json") is None:
+    """shared_df_blob이 None이면 로드 안내 메시지 표시."""
+    if st.session_state.get("shared_df_blob") is None:
         st.info(t("load_data_first"))
         return False
     return True
@@ -901,6 +687,47 @@ def _create_empty_wafer_df(n_rows: int = _MANUAL_EMPTY_ROWS) -> pd.DataFrame:
     })
 
 
+# =============================================================================
+# [7-1] 샘플 데이터 생성
+# =============================================================================
+
+_SAMPLE_N_WAFERS = 5
+_SAMPLE_N_POINTS = 400
+_SAMPLE_RADIUS   = 100
+
+def _generate_sample_data(data_folder: str) -> None:
+    """
+    샘플 웨이퍼 CSV 5개 생성 (wafer_01.csv ~ wafer_05.csv).
+    5장 × 400점을 (5, 400) 배열 한 번에 생성 → 웨이퍼별 루프 없음.
+    난수: SeedSequence.spawn으로 웨이퍼별 독립 PCG64 스트림 (전역 np.random 상태 미사용)
+    → 동시 세션 간 간섭 없음, 웨이퍼 수를 바꿔도 기존 웨이퍼 데이터 불변.
+    """
+    os.makedirs(data_folder, exist_ok=True)
+    n_w, n = _SAMPLE_N_WAFERS, _SAMPLE_N_POINTS
+    idx = np.arange(1, n_w + 1)[:, None]                 # (5, 1) 웨이퍼 번호
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(7).spawn(n_w)]
+
+    def _draw(fn, *args):
+        # 웨이퍼별 스트림에서 한 행씩 뽑아 (n_w, size) 배열로 결합
+        return np.stack([getattr(rng, fn)(*args) for rng in rngs])
+
+    r_pts = np.sqrt(_draw("uniform", 0, 1, n)) * _SAMPLE_RADIUS * 0.95
+    t_pts = _draw("uniform", 0, 2 * np.pi, n)
+    x_pts = (r_pts * np.cos(t_pts)).astype(np.float32)  # 좌표는 float32 (core와 동일)
+    y_pts = (r_pts * np.sin(t_pts)).astype(np.float32)
+    cx = _draw("uniform", -25, 25, 1)
+    cy = _draw("uniform", -25, 25, 1)
+    vals = (500 + idx * 8
+            + 35 * np.exp(-((x_pts-cx)**2 + (y_pts-cy)**2) / (2*38**2))
+            - 10 * np.exp(-((x_pts+cx)**2 + (y_pts+cy)**2) / (2*20**2))
+            + _draw("normal", 0, 1, n) * (idx * 1.5))
+
+    for i in range(n_w):
+        pd.DataFrame({"x": x_pts[i], "y": y_pts[i], "data": vals[i]}).to_csv(
+            os.path.join(data_folder, f"wafer_{i + 1:02d}.csv"), index=False
+        )
+
+
 # =============================================================================
 # [요청 4] README 표시 함수
 # =============================================================================
@@ -1021,22 +848,7 @@ if os.path.exists(data_folder):
 if not file_names:
     st.sidebar.warning(t("sidebar_no_files"))
     if st.sidebar.button(t("sidebar_sample_btn"), type="primary"):
-        os.makedirs(data_folder, exist_ok=True)
-        for idx in range(1, 6):
-            np.random.seed(idx * 7)
-            n, R = 400, 100
-            r_pts = np.sqrt(np.random.uniform(0, 1, n)) * R * 0.95
-            t_pts = np.random.uniform(0, 2 * np.pi, n)
-            x_pts = r_pts * np.cos(t_pts)
-            y_pts = r_pts * np.sin(t_pts)
-            cx, cy = np.random.uniform(-25, 25), np.random.uniform(-25, 25)
-            vals = (500 + idx * 8
-                    + 35 * np.exp(-((x_pts-cx)**2 + (y_pts-cy)**2) / (2*38**2))
-                    - 10 * np.exp(-((x_pts+cx)**2 + (y_pts+cy)**2) / (2*20**2))
-                    + np.random.normal(0, idx * 1.5, n))
-            pd.DataFrame({"x": x_pts, "y": y_pts, "data": vals}).to_csv(
-                os.path.join(data_folder, f"wafer_{idx:02d}.csv"), index=False
-            )
+        _generate_sample_data(data_folder)
         st.sidebar.success(t("sidebar_sample_done"))
         st.rerun()
 
@@ -1066,11 +878,11 @@ if has_files:
         # [요청 3] 편집 데이터도 초기화
         st.session_state.pop("edited_df", None)
         # 공유 데이터 초기화
-        for sk in ["shared_df_json", "shared_stats", "shared_fig_heatmap",
+        for sk in ["shared_df_blob", "shared_df_fp", "shared_stats", "shared_fig_heatmap",
                     "shared_fig_contour", "shared_fig_linescan", "shared_fig_3d",
                     "shared_df_raw", "shared_all_cols", "shared_wafer_radius",
-                    "shared_filename", "shared_raw_df_json",
-                    "shared_df_raw_original"]:
+                    "shared_filename",
+                    "shared_df_raw_original", "shared_df_raw_key"]:
             st.session_state[sk] = None
 else:
     selected_file  = None
@@ -1200,25 +1012,28 @@ with tab_wafer:
                     st.info(t("manual_input_hint"))
 
             if n_valid < 3:
-                st.session_state["shared_df_json"] = None
+                st.session_state["shared_df_blob"] = None
                 st.session_state["shared_filename"] = t("manual_label")
                 st.session_state["shared_all_cols"] = ["x", "y", "data"]
             else:
                 df_display = df_valid.copy()
-                df_json    = df_display.to_json()
+                df_blob    = df_to_blob(df_display)
+                df_fp      = blob_fingerprint(df_blob)
 
                 # [요청 5] st.spinner 추가
                 with st.spinner("..."):
-                    stats      = calculate_stats(df_json)
-                    fig_heatmap  = create_2d_heatmap(df_json, resolution, colorscale, show_points)
-                    fig_contour  = create_contour_map(df_json, resolution, colorscale,
-                                                      n_contours, show_points)
-                    fig_linescan = create_line_scan(df_json, line_angle, resolution)
-                    fig_3d       = create_3d_surface(df_json, resolution, colorscale)
-                    _, _, _, wafer_radius = get_wafer_grid(df_json, resolution)
+                    stats      = calculate_stats(df_blob, df_fp)
+                    fig_heatmap  = create_2d_heatmap(df_blob, resolution, colorscale,
+                                                     show_points, fp=df_fp)
+                    fig_contour  = create_contour_map(df_blob, resolution, colorscale,
+                                                      n_contours, show_points, fp=df_fp)
+                    fig_linescan = create_line_scan(df_blob, line_angle, resolution, df_fp)
+                    fig_3d       = create_3d_surface(df_blob, resolution, colorscale, df_fp)
+                    _, _, _, wafer_radius = get_wafer_grid(df_blob, resolution, df_fp)
 
                 # 공유 데이터 저장
-                st.session_state["shared_df_json"]      = df_json
+                st.session_state["shared_df_blob"]      = df_blob
+                st.session_state["shared_df_fp"]        = df_fp
                 st.session_state["shared_stats"]        = stats
                 st.session_state["shared_fig_heatmap"]  = fig_heatmap
                 st.session_state["shared_fig_contour"]  = fig_contour
@@ -1228,8 +1043,8 @@ with tab_wafer:
                 st.session_state["shared_all_cols"]     = ["x", "y", "data"]
                 st.session_state["shared_wafer_radius"] = float(wafer_radius)
                 st.session_state["shared_filename"]     = t("manual_label")
-                st.session_state["shared_raw_df_json"]  = df_json
                 st.session_state["shared_df_raw_original"] = df_display
+                st.session_state["shared_df_raw_key"]      = ("manual", df_fp)
 
                 st.markdown(
                     f"<div style='text-align:center;padding:7px;background:#1a6bbf;"
@@ -1306,20 +1121,23 @@ with tab_wafer:
                     df_display = apply_col_mapping(df_raw, x_col, y_col, data_col)
                     st.session_state._s_display = df_display
 
-                df_json = df_display.to_json()
+                df_blob = df_to_blob(df_display)
+                df_fp   = blob_fingerprint(df_blob)
 
                 # [요청 5] st.spinner 추가
                 with st.spinner("..."):
-                    stats      = calculate_stats(df_json)
-                    fig_heatmap  = create_2d_heatmap(df_json, resolution, colorscale, show_points)
-                    fig_contour  = create_contour_map(df_json, resolution, colorscale,
-                                                      n_contours, show_points)
-                    fig_linescan = create_line_scan(df_json, line_angle, resolution)
-                    fig_3d       = create_3d_surface(df_json, resolution, colorscale)
-                    _, _, _, wafer_radius = get_wafer_grid(df_json, resolution)
+                    stats      = calculate_stats(df_blob, df_fp)
+                    fig_heatmap  = create_2d_heatmap(df_blob, resolution, colorscale,
+                                                     show_points, fp=df_fp)
+                    fig_contour  = create_contour_map(df_blob, resolution, colorscale,
+                                                      n_contours, show_points, fp=df_fp)
+                    fig_linescan = create_line_scan(df_blob, line_angle, resolution, df_fp)
+                    fig_3d       = create_3d_surface(df_blob, resolution, colorscale, df_fp)
+                    _, _, _, wafer_radius = get_wafer_grid(df_blob, resolution, df_fp)
 
                 # 공유 데이터 저장
-                st.session_state["shared_df_json"]      = df_json
+                st.session_state["shared_df_blob"]      = df_blob
+                st.session_state["shared_df_fp"]        = df_fp
                 st.session_state["shared_stats"]        = stats
                 st.session_state["shared_fig_heatmap"]  = fig_heatmap
                 st.session_state["shared_fig_contour"]  = fig_contour
@@ -1329,8 +1147,10 @@ with tab_wafer:
                 st.session_state["shared_all_cols"]     = all_cols
                 st.session_state["shared_wafer_radius"] = float(wafer_radius)
                 st.session_state["shared_filename"]     = selected_file
-                st.session_state["shared_raw_df_json"]  = df_raw.to_json()
                 st.session_state["shared_df_raw_original"] = df_raw
+                # 원본 내용 식별 키 = load_file_cached 인자 (전체 경로, 시트) → GPC 캐시가 원본 재해싱 없이 조회
+                # (파일명만 쓰면 다른 폴더의 같은 이름 파일과 충돌 → 반드시 full_path)
+                st.session_state["shared_df_raw_key"]      = (full_path, selected_sheet)
 
                 # 제목 배너
                 wafer_title_banner(selected_file, prefix="single_")
@@ -1400,8 +1220,7 @@ with tab_wafer:
         st.markdown(t("compare_title"))
         st.caption(t("compare_caption"))
 
-        if "wm_datasets" not in st.session_state:
-            st.session_state.wm_datasets = []
+        datasets = _dataset_store()
 
         ctrl_col1, ctrl_col2 = st.columns([1, 1])
         with ctrl_col1:
@@ -1421,8 +1240,6 @@ with tab_wafer:
         _render_compare_dataset_manager()
         _render_compare_dataset_adder(file_names, data_folder)
 
-        datasets = st.session_state.get("wm_datasets", [])
-
         if len(datasets) < 2:
             st.info(t("compare_min_info"))
         else:
@@ -1432,36 +1249,25 @@ with tab_wafer:
 
             global_zmin, global_zmax = None, None
             if lock_scale:
-                series_list = []
-                for ds in datasets:
-                    try:
-                        if "df_json" in ds and ds["df_json"]:
-                            df_tmp = pd.read_json(ds["df_json"])
-                        else:
-                            dfc = load_file_cached(ds["file"], ds["sheet"])
-                            df_tmp = apply_col_mapping(
-                                dfc, ds["x_col"], ds["y_col"], ds["data_col"]
-                            )
-                        series_list.append(df_tmp["data"].dropna())
-                    except Exception:
-                        pass
-
-                if series_list:
-                    all_vals = pd.concat(series_list, ignore_index=True)
-                    global_zmin = float(all_vals.min())
-                    global_zmax = float(all_vals.max())
+                # 데이터셋 생성 시 저장한 (zmin, zmax)만 비교 → 데이터 재파싱 없음
+                z_ranges = [r for r in map(_dataset_zrange, datasets) if r is not None]
+                if z_ranges:
+                    global_zmin = min(r[0] for r in z_ranges)
+                    global_zmax = max(r[1] for r in z_ranges)
                     st.info(t("compare_scale_info").format(global_zmin, global_zmax))
 
+            payloads = _compute_compare_payloads(
+                datasets, resolution, colorscale,
+                n_contours, show_points,
+                global_zmin, global_zmax
+            )
+
             for batch_start in range(0, n_sel, cols_per_row):
-                batch = datasets[batch_start : batch_start + cols_per_row]
+                batch = range(batch_start, min(batch_start + cols_per_row, n_sel))
                 cols  = st.columns(len(batch))
-                for col, ds in zip(cols, batch):
+                for col, i in zip(cols, batch):
                     with col:
-                        _render_compare_card(
-                            ds, resolution, colorscale,
-                            n_contours, show_points,
-                            global_zmin, global_zmax
-                        )
+                        _render_compare_card(datasets[i], datasets.columns(i), payloads[i])
                 if batch_start + cols_per_row < n_sel:
                     st.markdown(
                         "<hr style='border:1px solid #ddd;'>",
@@ -1479,11 +1285,12 @@ with tab_defect:
         pass
     else:
         render_defect_tab(
-            wafer_df_json=st.session_state["shared_df_json"],
+            wafer_df_blob=st.session_state["shared_df_blob"],
             wafer_radius=st.session_state["shared_wafer_radius"],
             resolution=resolution,
             colorscale=colorscale,
             data_folder=data_folder,
+            wafer_fp=st.session_state.get("shared_df_fp"),
         )
 
 
@@ -1501,6 +1308,7 @@ with tab_gpc:
             all_cols=st.session_state.get("shared_all_cols", []),
             resolution=resolution,
             colorscale=colorscale,
+            df_key=st.session_state.get("shared_df_raw_key"),
         )
 
 
@@ -1535,35 +1343,23 @@ with tab_ml:
     else:
         app_initial_datasets = []
 
-        current_df_json  = st.session_state.get("shared_df_json")
+        current_df_blob  = st.session_state.get("shared_df_blob")
         current_filename = st.session_state.get("shared_filename", "")
-        if current_df_json is not None and current_filename:
+        if current_df_blob is not None and current_filename:
             app_initial_datasets.append({
                 "name":    os.path.splitext(current_filename)[0] if current_filename != t("manual_label") else t("manual_label"),
-                "df_json": current_df_json,
+                "df_json": current_df_blob,
             })
 
-        for ds in st.session_state.get("wm_datasets", []):
+        datasets = _dataset_store()
+        for i, ds in enumerate(datasets):
             if any(m["name"] == ds["name"] for m in app_initial_datasets):
                 continue
-            ds_json = ds.get("df_json")
-            if ds_json:
-                app_initial_datasets.append({
-                    "name":    ds["name"],
-                    "df_json": ds_json,
-                })
-            else:
-                try:
-                    df_ml = apply_col_mapping(
-                        load_file_cached(ds["file"], ds["sheet"]),
-                        ds["x_col"], ds["y_col"], ds["data_col"],
-                    )
-                    app_initial_datasets.append({
-                        "name":    ds["name"],
-                        "df_json": df_ml.to_json(),
-                    })
-                except Exception:
-                    pass
+            # DatasetStore 풀 view 튜플 그대로 전달 (blob 재인코딩 없음)
+            app_initial_datasets.append({
+                "name":    ds["name"],
+                "df_json": datasets.columns(i),
+            })
 
         render_anomaly_tab(
             datasets=app_initial_datasets,
@@ -15,15 +15,25 @@
 
 MODULES_STATUS: dict[str, bool] = {}
 
+
+def _make_fallback(label: str, err: Exception):
+    """모듈 로드 실패 시 대체 render 함수 생성 (어떤 인자로 호출돼도 경고만 표시).
+
+    except 블록의 `e`는 블록 종료 시 삭제되므로 오류 객체를 인자로 받아 클로저에 보관.
+    """
+    def _fallback(*args, **kwargs):
+        import streamlit as st
+        st.warning(f"⚠️ {label} 모듈 로드 실패: {err}")
+    return _fallback
+
+
 # ── [1] defect_overlay.py ─────────────────────────────────────────────────────
 try:
     from modules.defect_overlay import render_defect_tab
     MODULES_STATUS["defect_overlay"] = True
 except ImportError as e:
     MODULES_STATUS["defect_overlay"] = False
-    def render_defect_tab(wafer_df_json, wafer_radius, resolution, colorscale, data_folder):
-        import streamlit as st
-        st.warning(f"⚠️ 결함 오버레이 모듈 로드 실패: {e}")
+    render_defect_tab = _make_fallback("결함 오버레이", e)
 
 # ── [2] gpc.py ────────────────────────────────────────────────────────────────
 try:
@@ -31,9 +41,7 @@ try:
     MODULES_STATUS["gpc"] = True
 except ImportError as e:
     MODULES_STATUS["gpc"] = False
-    def render_gpc_tab(df_json, allcols, resolution, colorscale):
-        import streamlit as st
-        st.warning(f"⚠️ GPC 분석 모듈 로드 실패: {e}")
+    render_gpc_tab = _make_fallback("GPC 분석", e)
 
 # ── [3] report.py ─────────────────────────────────────────────────────────────
 try:
@@ -41,11 +49,7 @@ try:
     MODULES_STATUS["report"] = True
 except ImportError as e:
     MODULES_STATUS["report"] = False
-    def render_report_tab(filename, stats, df_display,
-                          fig_heatmap, fig_contour, fig_linescan, fig_3d,
-                          gpc_data=None):
-        import streamlit as st
-        st.warning(f"⚠️ 보고서 모듈 로드 실패: {e}")
+    render_report_tab = _make_fallback("보고서", e)
 
 # ── [4] ml_anomaly.py ────────────────────────────────────────────────────────
 try:
@@ -53,9 +57,7 @@ try:
     MODULES_STATUS["ml_anomaly"] = True
 except ImportError as e:
     MODULES_STATUS["ml_anomaly"] = False
-    def render_anomaly_tab(datasets, resolution, data_folder):
-        import streamlit as st
-        st.warning(f"⚠️ ML 이상 탐지 모듈 로드 실패: {e}")
+    render_anomaly_tab = _make_fallback("ML 이상 탐지", e)
 
 
 __all__ = [
@@ -14,11 +14,16 @@
 #        참조를 반환할 수 있음 → 캐시된 Figure가 영구 변경됨
 #      → 다음 호출 시 이미 결함 traces가 쌓인 Figure가 반환 → 중복 오버레이 버그
 #    새 Figure 생성 방식:
-#      create_defect_overlaid_map(@st.cache_data) {
-#          get_wafer_grid(wafer_df_json, resolution)  # 하위 캐시 재사용 ✅
+#      create_defect_overlaid_map → _defect_map_by_fp(@st.cache_resource) {
+#          get_wafer_grid(wafer_df_blob, resolution, wafer_fp)  # 하위 캐시 재사용 ✅
 #          → Heatmap trace + 아웃라인 + 결함 traces 모두 새 Figure에 구성
 #      }
 #      → 캐시 오염 없음, 완전한 상태 제어 가능
+#    웨이퍼 데이터 캐시 키 = fingerprint (app이 데이터 로드 시 1회 계산한 shared_df_fp)
+#      → rerun마다 웨이퍼 blob 전체를 해싱하지 않음, blob 자체는 _ 인자로 해시 제외
+#    결함 데이터 캐시 키 = 파일 키 (경로, mtime_ns, 크기), DataFrame은 _ 인자로 직접 전달
+#      → rerun마다 to_json 직렬화·문자열 해싱·JSON 파싱 없음 (로더 캐시의 공유 객체 그대로 사용)
+#    반환 Figure는 cache_resource 공유 객체 → 호출부는 그대로 렌더링만 (수정 금지)
 #
 # ② build_defect_traces는 @st.cache_data 미적용 내부 헬퍼로 구현
 #    go.Scatter 리스트를 @st.cache_data로 캐시하면:
@@ -39,15 +44,18 @@
 #      결함 max_coord < radius / 100 → 반대 방향 불일치 가능성 → 경고
 #    사용자 처리: 좌표 스케일 팩터 selectbox (×1, ×0.001, ×25.4, 직접입력)
 #
-# ⑤ load_defect_file의 @st.cache_data 적용
-#    full_path: str → hashable ✅
-#    파일 내용 변경 시: Streamlit 1.35+의 @st.cache_data는 파일 경로 기반 캐시
-#    → 파일이 변경돼도 경로가 같으면 캐시 히트 (파일 내용 hash 미지원)
-#    → 엔지니어가 파일 교체 후 "재로드" 버튼을 명시적으로 누르는 UX 설계
+# ⑤ load_defect_file 캐시: @st.cache_resource, 키 = (경로, mtime, 크기)
+#    cache_data는 히트마다 DataFrame pickle 복원(전체 복사) → rerun마다 결함 수 × 컬럼 비용
+#    cache_resource는 동일 객체 반환 → 반환 df는 공유 객체 (호출부에서 수정 금지)
+#    파일 교체/수정 시 mtime·크기가 바뀌어 자동 재로드 (같은 경로라도 stale 캐시 없음)
+#
+# ⑥ 결함 파일 목록 캐시: @st.cache_data(ttl=30), 키 = (폴더, 폴더 mtime_ns)
+#    위젯 조작마다 rerun → 폴더 스캔 + 정렬이 매번 폴더 전체를 다시 읽음 (네트워크 드라이브에서 지연 큼)
+#    스캔은 os.scandir 1회 (glob 3회 대비 디렉터리 읽기 1/3, 파일 여부는 dirent 정보로 판별)
+#    파일 추가/삭제 시 폴더 mtime이 바뀌어 재스캔, mtime 갱신이 늦은 마운트는 ttl로 보완
 # =============================================================================
 
 # ── 표준 라이브러리 ─────────────────────────────────────────────────────────
-import glob
 import os
 
 # ── 외부 라이브러리 ─────────────────────────────────────────────────────────
@@ -56,12 +64,24 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
-# ── wafer_app_global 핵심 함수 import ────────────────────────────────────────
+# numexpr: 선택 의존성 (미설치 시 numpy 식으로 계산)
+try:
+    import numexpr as ne
+    _NUMEXPR_OK = True
+except ImportError:
+    _NUMEXPR_OK = False
+
+# ── core 핵심 함수 import ─────────────────────────────────────────────────
 # add_wafer_outline: 단일 Figure 전용 (row/col 없음) → 여기서는 직접 사용 가능
 # _wafer_layout: 단일 Figure 전용 → create_defect_overlaid_map에서 재사용
-from app import _wafer_layout  # 원형 유지 공통 레이아웃 딕셔너리 반환
-from app import add_wafer_outline  # 웨이퍼 원형 테두리 + Notch 추가
-from app import get_wafer_grid  # 불규칙 산점 → 균일 그리드 보간 (@st.cache_data 적용)
+from core import _FIG_CACHE_MAX  # Figure 캐시 최대 항목 수 (core 시각화 캐시와 동일)
+from core import _hash_df  # 결함 DataFrame 전체 행 해시 (파일 키 미전달 시 캐시 키)
+from core import _read_csv_fast  # CSV 로드 (pyarrow 멀티스레드 파서 우선)
+from core import _read_excel_fast  # Excel 로드 (calamine 엔진 우선)
+from core import _wafer_layout  # 원형 유지 공통 레이아웃 딕셔너리 반환
+from core import add_wafer_outline  # 웨이퍼 원형 테두리 + Notch 추가
+from core import blob_fingerprint  # 웨이퍼 blob → 캐시 키 fingerprint (fp 미전달 시)
+from core import get_wafer_grid  # 불규칙 산점 → 균일 그리드 보간 (@st.cache_resource 적용, 읽기 전용 배열)
 
 # =============================================================================
 # session_state 키 상수 (prefix: "def_")
@@ -76,6 +96,9 @@ _SS_CLASSES   = "def_classes"      # 선택된 클래스 multiselect 값 (list)
 _SS_OUTSIDE   = "def_show_outside" # 웨이퍼 외부 결함 포함 여부 (bool)
 _SS_SCALE     = "def_coord_scale"  # 좌표 스케일 팩터 (float)
 
+# 결함 파일 목록 대상 확장자 (소문자 비교)
+_DATA_FILE_EXTS = (".csv", ".xlsx", ".xls")
+
 
 # =============================================================================
 # 결함 심볼 및 컬러 팔레트 상수
@@ -92,6 +115,12 @@ _DEFECT_SYMBOLS = [
     "star",          # ★  별
 ]
 
+# Plotly 심볼 숫자 코드 (배치 trace에서 점별 심볼을 문자열 대신 정수로 전송)
+_SYMBOL_CODES = {
+    "circle": 0, "square": 1, "diamond": 2, "cross": 3,
+    "x": 4, "triangle-up": 5, "triangle-down": 6, "star": 17,
+}
+
 # Plotly D3 + Safe 결합 팔레트 (가독성 높은 24색 순환)
 # 인접 색상이 충분히 구별되도록 밝기/채도 다양하게 구성
 _COLOR_PALETTE = [
@@ -121,24 +150,91 @@ _COLOR_PALETTE = [
     "#228B22",  # 포레스트그린
 ]
 
+# 클래스 인덱스로 직접 조회하는 배열판 (스타일 할당 시 dict 생성 없이 fancy indexing)
+_DEFECT_SYMBOLS_ARR      = np.array(_DEFECT_SYMBOLS, dtype=object)
+_DEFECT_SYMBOL_CODES_ARR = np.array([_SYMBOL_CODES[s] for s in _DEFECT_SYMBOLS])
+_COLOR_PALETTE_ARR       = np.array(_COLOR_PALETTE, dtype=object)
+
 # 마커 크기 정규화 범위 (픽셀)
 _MARKER_SIZE_MIN = 4
 _MARKER_SIZE_MAX = 18
 _MARKER_SIZE_DEFAULT = 10   # "size" 컬럼 없을 때 고정 크기
 
+# 어느 한 클래스라도 마커가 이 수를 넘으면 전체 결함 trace를 WebGL(Scattergl)로 렌더링
+# (trace 종류를 통일해야 레이어 순서가 섞이지 않음)
+_DEFECT_GL_MIN_MARKERS = 500
+
+# 표시 클래스가 이 수를 넘으면 클래스별 trace 대신 단일 Scattergl + 범례 전용 stub으로 묶음
+# (trace 수가 많을수록 JSON 크기·렌더링 비용 증가. 이하일 때는 범례 클릭 토글 유지)
+_DEFECT_BATCH_MAX_CLASSES = 8
+
+# 결함 마커 테두리 (반투명 검정 → 배경과 구별). trace마다 dict 재생성하지 않도록 상수화
+_MARKER_LINE = {"width": 1.5, "color": "rgba(0,0,0,0.6)"}
+
+# hover 템플릿 (클래스명만 {cls}로 치환 — Plotly 자리표시자 중괄호는 {{ }} 이스케이프)
+_HOVER_WITH_DESC = (
+    "<b>클래스: {cls}</b><br>"
+    "위치: (%{{x:.1f}}, %{{y:.1f}}) mm<br>"
+    "크기: %{{marker.size:.1f}}<br>"
+    "설명: %{{customdata}}<extra></extra>"
+)
+_HOVER_NO_DESC = (
+    "<b>클래스: {cls}</b><br>"
+    "위치: (%{{x:.1f}}, %{{y:.1f}}) mm<br>"
+    "크기: %{{marker.size:.1f}}<extra></extra>"
+)
+
 
 # =============================================================================
 # [함수 1] load_defect_file
 # =============================================================================
 
-@st.cache_data
+def _defect_file_key(full_path: str) -> tuple[str, int, int] | None:
+    """결함 파일 캐시 키 (경로, mtime_ns, 크기). 파일이 없으면 None."""
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+    return full_path, stat.st_mtime_ns, stat.st_size
+
+
 def load_defect_file(full_path: str) -> pd.DataFrame | None:
+    """
+    결함 데이터 CSV/Excel 파일 로드 및 전처리 (캐시 래퍼).
+    ⚠️ 반환 DataFrame은 캐시 공유 객체 → 수정 필요 시 복사 후 사용
+    """
+    key = _defect_file_key(full_path)
+    return None if key is None else _load_defect_file_cached(*key)
+
+
+@st.cache_data(ttl=30, show_spinner=False, max_entries=8)
+def _list_data_files(folder: str, mtime_ns: int) -> list[str]:
+    """
+    data_folder 내 CSV/XLSX/XLS 파일 전체 경로 목록 (정렬됨).
+
+    mtime_ns는 캐시 키 용도 — 파일 추가/삭제 시 폴더 mtime이 바뀌어 재스캔.
+    """
+    # scandir 1회로 확장자 분류 (glob 3회 = 디렉터리 3회 읽기 + fnmatch 대비)
+    # 숨김 파일은 glob("*.csv")와 동일하게 제외, 확장자는 대소문자 무관 (로더와 동일 기준)
+    with os.scandir(folder) as it:
+        files = [
+            e.path for e in it
+            if not e.name.startswith(".")
+            and e.name.lower().endswith(_DATA_FILE_EXTS)
+            and e.is_file()
+        ]
+    files.sort()
+    return files
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_defect_file_cached(full_path: str, mtime_ns: int, size: int) -> pd.DataFrame | None:
     """
     결함 데이터 CSV/Excel 파일 로드 및 전처리.
 
-    [@st.cache_data 적용 이유]
-    full_path: str → hashable → 캐시 키로 사용 가능.
-    사이드바 슬라이더, 컬러스케일 변경 등 다른 UI 조작 시 재로드 방지.
+    [@st.cache_resource 적용 이유]
+    캐시 키 = (full_path, mtime_ns, size) → 파일 수정 시에만 재로드.
+    사이드바 슬라이더, 컬러스케일 변경 등 다른 UI 조작 시 재로드·DataFrame 복사 없음.
 
     [표준화 처리]
     1. 컬럼명 소문자 정규화 → 대소문자 무관한 인식 (X→x, Y→y 등)
@@ -147,25 +243,29 @@ def load_defect_file(full_path: str) -> pd.DataFrame | None:
     3. "size" 컬럼 없으면 _MARKER_SIZE_DEFAULT 고정값 채움
        → 마커 크기 정규화 로직을 단순화
     4. "description" 컬럼 없으면 빈 문자열 채움 → hover 템플릿 통일
+    5. "class"는 category dtype (카테고리 = 정렬된 클래스 목록)
 
     [필수 컬럼 검증]
     x, y 컬럼이 없으면 None 반환 (오류는 호출부에서 st.error 처리)
 
     인자:
         full_path: CSV/Excel 파일의 절대 경로
+        mtime_ns : 파일 수정 시각 (캐시 키 전용)
+        size     : 파일 크기 (캐시 키 전용)
 
     반환:
         pd.DataFrame: 표준화된 결함 데이터프레임
         None        : x/y 컬럼 없거나 파일 로드 실패 시
     """
     # ── 파일 로드 ─────────────────────────────────────────────────────────────
+    # 측정 데이터와 같은 고속 로더 사용 (pyarrow / calamine, 미설치 시 기본 엔진)
     try:
         if full_path.lower().endswith(".csv"):
-            df = pd.read_csv(full_path)
+            df = _read_csv_fast(full_path)
         else:
-            df = pd.read_excel(full_path, sheet_name=0)
+            df = _read_excel_fast(full_path, sheet_name=0)
     except Exception as e:
-        # @st.cache_data 내부에서 st.error를 직접 호출하면 안 됨
+        # 캐시 함수 내부에서 st.error를 직접 호출하면 안 됨
         # → None 반환 후 호출부에서 처리
         return None
 
@@ -210,7 +310,9 @@ def load_defect_file(full_path: str) -> pd.DataFrame | None:
             df["class"] = "Unknown"
 
     # "class" 값의 NA를 "Unknown"으로 채움
-    df["class"] = df["class"].fillna("Unknown").astype(str)
+    # category dtype: 클래스 문자열은 1회만 저장, value_counts·isin·Categorical 재코딩이
+    # 문자열 해싱 대신 정수 코드 배열로 처리됨 (결함 수 × 문자열 객체 메모리도 제거)
+    df["class"] = df["class"].fillna("Unknown").astype(str).astype("category")
 
     # "size" 컬럼: 없으면 고정 기본값, 있으면 숫자형 변환
     if "size" not in df.columns:
@@ -229,37 +331,53 @@ def load_defect_file(full_path: str) -> pd.DataFrame | None:
     return df
 
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _class_summary_cached(full_path: str, mtime_ns: int, size: int) -> tuple[pd.Series, list[str], bool] | None:
+    """
+    클래스 집계 캐시. 키는 _load_defect_file_cached와 동일 → 로드 결과 공유, 파일 변경 시 재집계.
+    클래스 multiselect·체크박스 등 rerun마다 class 컬럼 value_counts,
+    description 문자열 전체 비교(테이블 컬럼 표시 여부)를 다시 돌지 않음.
+    """
+    df = _load_defect_file_cached(full_path, mtime_ns, size)
+    if df is None:
+        return None
+    class_counts = df["class"].value_counts()
+    # category dtype의 카테고리 = 정렬된 고유 클래스 (전체 행 unique 스캔 없음)
+    has_description = bool(df["description"].ne("").any())
+    return class_counts, df["class"].cat.categories.tolist(), has_description
+
+
 # =============================================================================
 # [함수 2] _assign_class_styles (내부 헬퍼)
 # =============================================================================
 
-def _assign_class_styles(classes: list[str]) -> dict[str, dict]:
+def _assign_class_styles(n_classes: int) -> tuple[np.ndarray, np.ndarray]:
     """
-    결함 클래스 목록에 심볼과 색상을 할당하여 딕셔너리 반환.
+    클래스 인덱스(0..n_classes-1)별 심볼·색상 배열 반환.
 
     [할당 전략]
     클래스 수 ≤ 8: 심볼 1:1 할당 (색상도 팔레트 순서대로)
     클래스 수 9+: 심볼(8종) × 색상(24종) 조합으로 최대 192가지 지원
-      symbol_idx = class_idx % 8         → 심볼 8종 순환
-      color_idx  = class_idx // 8 % 24   → 색상 24종 순환 (심볼 1바퀴마다 전환)
+      symbol_idx = class_idx % 8                    → 심볼 8종 순환
+      color_idx  = (class_idx // 8 + class_idx) % 24 → 심볼 1바퀴마다 색상 한 칸 밀림
       예: 클래스 9번 → 심볼 1번(circle)로 돌아오지만 색상은 다음 팔레트 색 사용
 
+    [배열 반환 이유]
+    클래스명 → dict 대신 selected_classes 인덱스(Categorical 코드)로 바로 조회
+    → 클래스별 dict 생성/해시 조회 없음, 점별 배열도 arr[codes]로 한 번에 생성
+
     인자:
-        classes: 고유 클래스명 리스트 (순서가 할당 순서가 됨)
+        n_classes: 클래스 수 (selected_classes 순서가 할당 순서)
 
     반환:
-        {class_name: {"symbol": str, "color": str}} 딕셔너리
+        (symbols, colors): 길이 n_classes의 object 배열 (심볼명, 색상 hex)
     """
-    styles = {}
-    for i, cls in enumerate(classes):
-        symbol_idx = i % len(_DEFECT_SYMBOLS)
-        # 심볼 1바퀴(8개) 마다 다음 색상 그룹으로 전환
-        color_idx  = (i // len(_DEFECT_SYMBOLS) + i) % len(_COLOR_PALETTE)
-        styles[cls] = {
-            "symbol": _DEFECT_SYMBOLS[symbol_idx],
-            "color":  _COLOR_PALETTE[color_idx],
-        }
-    return styles
+    i = np.arange(n_classes)
+    n_sym = len(_DEFECT_SYMBOLS)
+    return (
+        _DEFECT_SYMBOLS_ARR[i % n_sym],
+        _COLOR_PALETTE_ARR[(i // n_sym + i) % len(_COLOR_PALETTE)],
+    )
 
 
 # =============================================================================
@@ -284,20 +402,25 @@ def _normalize_marker_sizes(sizes: np.ndarray) -> np.ndarray:
     반환:
         마커 픽셀 크기 배열 [_MARKER_SIZE_MIN, _MARKER_SIZE_MAX] 범위
     """
-    # NaN을 기본값으로 대체
-    sizes = np.where(np.isnan(sizes), float(_MARKER_SIZE_DEFAULT), sizes)
-    # 음수 크기는 절댓값으로 처리
-    sizes = np.abs(sizes)
+    # 음수 크기는 절댓값으로 처리 (새 버퍼 1개 — 입력 배열은 DataFrame 뷰일 수 있어 보존)
+    sizes = np.abs(sizes, dtype=np.float64)
+    # NaN을 기본값으로 대체 (같은 버퍼에서 in-place)
+    np.nan_to_num(sizes, copy=False, nan=float(_MARKER_SIZE_DEFAULT))
 
     s_min = sizes.min()
     s_max = sizes.max()
 
     if s_max - s_min < 1e-10:
         # 모든 값이 동일 → 정규화 불가 → 중간값으로 고정
-        return np.full_like(sizes, float((_MARKER_SIZE_MIN + _MARKER_SIZE_MAX) / 2))
+        sizes.fill((_MARKER_SIZE_MIN + _MARKER_SIZE_MAX) / 2)
+        return sizes
 
-    normalized = (sizes - s_min) / (s_max - s_min)
-    return normalized * (_MARKER_SIZE_MAX - _MARKER_SIZE_MIN) + _MARKER_SIZE_MIN
+    # (sizes - s_min) × scale + MIN 을 같은 버퍼에서 in-place 계산
+    scale = (_MARKER_SIZE_MAX - _MARKER_SIZE_MIN) / (s_max - s_min)
+    np.subtract(sizes, s_min, out=sizes)
+    np.multiply(sizes, scale, out=sizes)
+    np.add(sizes, _MARKER_SIZE_MIN, out=sizes)
+    return sizes
 
 
 # =============================================================================
@@ -317,11 +440,16 @@ def _build_defect_traces(
     [@st.cache_data 미적용 이유]
     go.Scatter 리스트를 캐시하면 pickle 직렬화 오버헤드 + 반환된 trace 객체가
     외부에서 수정될 위험이 있음.
-    → create_defect_overlaid_map(@st.cache_data) 내부에서만 호출하는 헬퍼로 설계.
+    → create_defect_overlaid_map(캐시 본체) 내부에서만 호출하는 헬퍼로 설계.
     → 전체 Figure 캐시(상위)가 미스일 때만 이 함수가 실행됨.
 
+    [클래스 분할]
+    selected_classes 기준 Categorical 코드 → stable argsort 1회로 클래스별 위치 분할
+    (코드 순서 = selected_classes 순서 → 범례 순서 유지)
+    표시 클래스 > _DEFECT_BATCH_MAX_CLASSES 이면 단일 Scattergl + 범례 stub으로 묶음
+
     [마커 크기 처리]
-    all_sizes_same = (df_defect["size"].nunique() == 1)
+    all_same_size = (size.min() == size.max())
     → 모두 같으면 정규화 의미 없음 → 클래스별로 고정 크기 사용
 
     [좌표 스케일 팩터]
@@ -341,89 +469,103 @@ def _build_defect_traces(
     if df_defect is None or df_defect.empty:
         return []
 
-    # 스케일 팩터 적용 (1.0이 아닐 때만 실제 변환)
-    if abs(coord_scale - 1.0) > 1e-10:
-        df_defect = df_defect.copy()
-        df_defect["x"] = df_defect["x"] * coord_scale
-        df_defect["y"] = df_defect["y"] * coord_scale
+    # ── 클래스 필터 → 좌표 스케일 → 원 필터 (numpy 배열, DataFrame 복사 없음) ──
+    # 클래스 코드 (selected_classes 내 인덱스, 미선택 클래스 = -1)
+    codes = pd.Categorical(
+        df_defect["class"], categories=list(selected_classes)
+    ).codes
 
-    # 선택된 클래스만 필터링
-    df_filtered = df_defect[df_defect["class"].isin(selected_classes)].copy()
+    # 선택된 클래스 행 위치 → 좌표는 이 행만 추출 (fancy indexing = 새 버퍼)
+    sel = np.flatnonzero(codes >= 0)
+    x = df_defect["x"].to_numpy(dtype=np.float64)[sel]
+    y = df_defect["y"].to_numpy(dtype=np.float64)[sel]
 
-    if df_filtered.empty:
-        return []
+    # 스케일은 추출된 버퍼에 in-place (1.0이 아닐 때만 실제 곱셈)
+    if abs(coord_scale - 1.0) > 1e-10:
+        x *= coord_scale
+        y *= coord_scale
 
-    # 웨이퍼 원 밖 결함 필터링 (show_outside=False일 때)
+    # show_outside=False이면 웨이퍼 원 안쪽만 유지
     if not show_outside:
-        inside_mask = (df_filtered["x"] ** 2 + df_filtered["y"] ** 2 <= wafer_radius ** 2)
-        df_filtered = df_filtered[inside_mask].copy()
+        inside = x * x + y * y <= wafer_radius * wafer_radius
+        sel, x, y = sel[inside], x[inside], y[inside]
 
-    if df_filtered.empty:
+    if not sel.size:
         return []
 
+    # 전송용 좌표는 float32 (Plotly가 numpy 배열을 typed array로 인코딩 → JSON 크기 절반)
+    codes = codes[sel]
+    xs    = x.astype(np.float32)
+    ys    = y.astype(np.float32)
+    descs = df_defect["description"].to_numpy()[sel]
+    raw_sizes = df_defect["size"].to_numpy()[sel]
+
     # 클래스 스타일 할당 (selected_classes 순서로 일관성 유지)
-    styles = _assign_class_styles(list(selected_classes))
+    symbols, colors = _assign_class_styles(len(selected_classes))
 
     # 전체 크기 정규화 여부 판단
     # 모든 size 값이 동일하면 정규화 의미 없음 → 고정 크기 사용
-    all_same_size = (df_defect["size"].nunique() == 1)
-
-    traces = []
-    for cls in selected_classes:
-        # 이 클래스에 해당하는 결함만 추출
-        cls_df = df_filtered[df_filtered["class"] == cls]
-        if cls_df.empty:
+    # (nunique의 해시 집계 대신 min/max 비교, NaN은 둘 다 무시)
+    size_col = df_defect["size"]
+    all_same_size = bool(size_col.min() == size_col.max())
+
+    # ── 클래스별 위치 분할 (stable argsort 1회 → 클래스 내 원래 순서 유지) ──────
+    counts = np.bincount(codes, minlength=len(selected_classes))
+    groups = np.split(np.argsort(codes, kind="stable"), np.cumsum(counts)[:-1])
+
+    # ── 마커 크기 계산 (클래스 단위) ──────────────────────────────────────────
+    sizes_px = np.empty(len(codes), dtype=np.float32)
+    for idx, pos in enumerate(groups):
+        if not pos.size:
             continue
-
-        style = styles.get(cls, {"symbol": "x", "color": "#E41A1C"})
-
-        # ── 마커 크기 계산 ────────────────────────────────────────────────────
         if all_same_size:
             # 모든 결함이 같은 크기 → 클래스 인덱스로 약간 차별화 (8~12px)
-            idx       = list(selected_classes).index(cls)
-            sizes_px  = np.full(len(cls_df), float(_MARKER_SIZE_DEFAULT + idx % 4))
+            sizes_px[pos] = float(_MARKER_SIZE_DEFAULT + idx % 4)
         else:
             # size 컬럼 값을 픽셀 범위로 MinMax 정규화
             # ★ 클래스별 독립 정규화가 아닌 이 클래스의 원본 크기를 직접 정규화
             # → 클래스 내 상대적 크기 차이를 마커로 표현 (큰 결함 = 큰 마커)
-            cls_size_raw = cls_df["size"].values
-            sizes_px = _normalize_marker_sizes(cls_size_raw)
-
-        # ── hover 템플릿 구성 ─────────────────────────────────────────────────
-        # %{text}: go.Scatter의 text 인자로 전달되는 추가 정보
-        # customdata: description 컬럼 (빈 문자열 가능)
-        has_desc = cls_df["description"].ne("").any()
-        if has_desc:
-            hover_template = (
-                f"<b>클래스: {cls}</b><br>"
-                "위치: (%{x:.1f}, %{y:.1f}) mm<br>"
-                "크기: %{marker.size:.1f}<br>"
-                "설명: %{customdata}<extra></extra>"
-            )
-        else:
-            hover_template = (
-                f"<b>클래스: {cls}</b><br>"
-                "위치: (%{x:.1f}, %{y:.1f}) mm<br>"
-                "크기: %{marker.size:.1f}<extra></extra>"
-            )
+            sizes_px[pos] = _normalize_marker_sizes(raw_sizes[pos])
+
+    # ── hover 템플릿 구성 ─────────────────────────────────────────────────────
+    # customdata: description 컬럼 (빈 문자열 가능)
+    # description 유무는 클래스별로 판단 (배치 모드에서는 전체 기준)
+    has_desc_all = descs != ""
+
+    if np.count_nonzero(counts) > _DEFECT_BATCH_MAX_CLASSES:
+        return _build_batched_defect_trace(
+            selected_classes, symbols, colors, codes, xs, ys, sizes_px, descs,
+            bool(has_desc_all.any())
+        )
+
+    # 대량 결함 → SVG 대신 WebGL trace 사용 (브라우저 렌더링 병목 완화)
+    scatter_cls = (
+        go.Scattergl if counts.max() > _DEFECT_GL_MIN_MARKERS else go.Scatter
+    )
+
+    traces = []
+    for idx, pos in enumerate(groups):
+        if not pos.size:
+            continue
+        cls = selected_classes[idx]
+
+        has_desc = bool(has_desc_all[pos].any())
+        hover_template = (_HOVER_WITH_DESC if has_desc else _HOVER_NO_DESC).format(cls=cls)
 
         traces.append(
-            go.Scatter(
-                x=cls_df["x"].values,
-                y=cls_df["y"].values,
+            scatter_cls(
+                x=xs[pos],
+                y=ys[pos],
                 mode="markers",
                 name=f"결함: {cls}",          # 범례에 표시
-                text=[cls] * len(cls_df),      # hover용 텍스트 (클래스명)
-                customdata=cls_df["description"].values,
+                # 클래스명은 hovertemplate에 직접 포함 → 점별 text 불필요
+                customdata=descs[pos] if has_desc else None,
                 marker=dict(
-                    symbol=style["symbol"],
-                    size=sizes_px.tolist(),
-                    color=style["color"],
+                    symbol=symbols[idx],
+                    size=sizes_px[pos],
+                    color=colors[idx],
                     opacity=0.85,
-                    line=dict(
-                        width=1.5,
-                        color="rgba(0,0,0,0.6)",   # 반투명 검정 테두리 → 배경과 구별
-                    ),
+                    line=_MARKER_LINE,
                 ),
                 hovertemplate=hover_template,
                 showlegend=True,
@@ -433,31 +575,136 @@ def _build_defect_traces(
     return traces
 
 
+def _build_batched_defect_trace(
+    selected_classes: tuple,
+    symbols: np.ndarray,
+    colors: np.ndarray,
+    codes: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    sizes_px: np.ndarray,
+    descs: np.ndarray,
+    has_desc: bool,
+) -> list:
+    """
+    클래스가 많을 때: 전체 결함을 단일 Scattergl(점별 color/symbol 배열)로 묶고,
+    범례는 클래스마다 빈 좌표 stub trace로만 표시.
+
+    [trade-off]
+    범례 stub은 표시 전용 → 범례 클릭으로 클래스별 숨김 불가
+    (클래스 선택은 사이드바 multiselect로 수행)
+    """
+    class_names = np.asarray(selected_classes, dtype=object)
+
+    # 점별 색상: 색 문자열 배열 대신 클래스 코드 + 계단형 colorscale
+    # (클래스 i → 구간 [i/k, (i+1)/k] 단색, cmin/cmax ±0.5로 코드가 구간 중앙에 매핑)
+    k = len(selected_classes)
+    colorscale = []
+    for i, c in enumerate(colors):
+        colorscale += [[i / k, c], [(i + 1) / k, c]]
+
+    traces = [
+        go.Scattergl(
+            x=xs,
+            y=ys,
+            mode="markers",
+            name="결함",
+            text=class_names[codes],       # hover용 클래스명 (점별)
+            customdata=descs if has_desc else None,
+            marker=dict(
+                symbol=_DEFECT_SYMBOL_CODES_ARR[codes % len(_DEFECT_SYMBOLS)],
+                size=sizes_px,
+                color=codes,
+                colorscale=colorscale,
+                cmin=-0.5,
+                cmax=k - 0.5,
+                showscale=False,
+                opacity=0.85,
+                line=_MARKER_LINE,
+            ),
+            # 클래스명 자리에 점별 text 참조
+            hovertemplate=(_HOVER_WITH_DESC if has_desc else _HOVER_NO_DESC).format(cls="%{text}"),
+            showlegend=False,
+        )
+    ]
+
+    # 범례 전용 stub (실제 점 없음)
+    for idx in np.unique(codes):
+        traces.append(
+            go.Scatter(
+                x=[None], y=[None],
+                mode="markers",
+                name=f"결함: {selected_classes[idx]}",
+                marker=dict(
+                    symbol=symbols[idx],
+                    size=_MARKER_SIZE_DEFAULT,
+                    color=colors[idx],
+                    line=_MARKER_LINE,
+                ),
+                hoverinfo="skip",
+                showlegend=True,
+            )
+        )
+    return traces
+
+
 # =============================================================================
-# [함수 5] create_defect_overlaid_map (@st.cache_data 적용)
+# [함수 5] create_defect_overlaid_map (본체 _defect_map_by_fp @st.cache_resource 적용)
 # =============================================================================
 
-@st.cache_data
 def create_defect_overlaid_map(
-    wafer_df_json: str,
-    defect_df_json: str,
-    selected_classes: tuple,   # tuple 필수: list는 @st.cache_data 해시 불가
+    wafer_df_blob: bytes,
+    df_defect: pd.DataFrame,
+    selected_classes: tuple,
     resolution: int,
     colorscale: str,
-    base_map_type: str,        # "heatmap" 또는 "contour"
+    base_map_type: str,
     show_outside: bool,
     coord_scale: float = 1.0,
     n_contours: int = 20,
+    wafer_fp: str = None,
+    defect_key: tuple = None,
+) -> go.Figure:
+    """
+    웨이퍼 맵 + 결함 오버레이 Figure (캐시 래퍼).
+    wafer_fp  : 웨이퍼 blob의 blob_fingerprint (없으면 여기서 계산)
+    defect_key: df_defect를 대표하는 키 — 보통 결함 파일 키 (없으면 전체 행 해시)
+    ⚠️ 반환 Figure는 캐시 공유 객체 → 수정 필요 시 go.Figure(fig)로 복사 후 사용
+    """
+    return _defect_map_by_fp(
+        wafer_fp or blob_fingerprint(wafer_df_blob),
+        defect_key or _hash_df(df_defect).hex(),
+        selected_classes, resolution, colorscale,
+        base_map_type, show_outside, coord_scale, n_contours,
+        wafer_df_blob, df_defect,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=_FIG_CACHE_MAX)
+def _defect_map_by_fp(
+    wafer_fp: str,
+    defect_key,
+    selected_classes: tuple,   # tuple 필수: list는 캐시 키 해시 불가
+    resolution: int,
+    colorscale: str,
+    base_map_type: str,        # "heatmap" 또는 "contour"
+    show_outside: bool,
+    coord_scale: float,
+    n_contours: int,
+    _wafer_df_blob: bytes,
+    _df_defect: pd.DataFrame,
 ) -> go.Figure:
     """
     웨이퍼 맵(Heatmap/Contour) 위에 결함 오버레이된 통합 Figure 생성.
 
     [캐시 키 구성 요소]
-    (wafer_df_json, defect_df_json, selected_classes, resolution,
+    (wafer_fp, defect_key, selected_classes, resolution,
      colorscale, base_map_type, show_outside, coord_scale, n_contours)
-    - 결함 파일 변경 → defect_df_json 달라짐 → 자동 캐시 갱신
+    - 결함 파일 변경 → defect_key(mtime·크기) 달라짐 → 자동 캐시 갱신
     - 클래스 필터 변경 → selected_classes tuple 달라짐 → 자동 캐시 갱신
-    - 웨이퍼 데이터 편집 → wafer_df_json 달라짐 → 자동 캐시 갱신
+    - 웨이퍼 데이터 편집 → wafer_fp 달라짐 → 자동 캐시 갱신
+    - _wafer_df_blob: 해시 제외 (내용은 wafer_fp가 대표) → rerun마다 blob 전체 해싱 없음
+    - _df_defect: 해시 제외 (내용은 defect_key가 대표) → 직렬화·해싱 없이 DataFrame 그대로 사용
 
     [새 Figure 생성 방식 선택 이유]
     기존 create_2d_heatmap 캐시에서 반환된 Figure를 직접 수정하면
@@ -470,8 +717,8 @@ def create_defect_overlaid_map(
     3. 결함 Scatter traces         — 최상위 (클릭/호버 가능)
 
     인자:
-        wafer_df_json   : 웨이퍼 측정 데이터 JSON (x, y, data 컬럼 필수)
-        defect_df_json  : 결함 데이터 JSON (표준화 완료 상태)
+        wafer_fp        : 웨이퍼 blob fingerprint (캐시 키)
+        defect_key      : 결함 데이터 키 (캐시 키)
         selected_classes: 표시할 클래스명 tuple
         resolution      : 보간 그리드 해상도 (30~200)
         colorscale      : Plotly 컬러스케일 이름
@@ -479,14 +726,16 @@ def create_defect_overlaid_map(
         show_outside    : True이면 웨이퍼 원 밖 결함도 표시
         coord_scale     : 결함 좌표 스케일 팩터 (기본 1.0)
         n_contours      : Contour 등고선 수 (base_map_type="contour" 시만 사용)
+        _wafer_df_blob  : 웨이퍼 측정 데이터 Arrow IPC blob (x, y, data 컬럼 필수, 해시 제외)
+        _df_defect      : 표준화된 결함 DataFrame (load_defect_file 반환값, 해시 제외·읽기 전용)
 
     반환:
         go.Figure: 오버레이 완성된 Figure
     """
     # ── 웨이퍼 그리드 보간 (하위 캐시 재사용) ──────────────────────────────
-    # get_wafer_grid는 wafer_app_global에서 @st.cache_data 적용됨
-    # → 이전에 동일 wafer_df_json + resolution으로 호출됐으면 캐시 히트
-    XI, YI, ZI, radius = get_wafer_grid(wafer_df_json, resolution)
+    # get_wafer_grid는 core에서 (fp, resolution) 키 @st.cache_resource 적용됨
+    # → 메인 탭에서 동일 데이터 + resolution으로 이미 보간했으면 캐시 히트
+    xi, yi, ZI, radius = get_wafer_grid(_wafer_df_blob, resolution, wafer_fp)
 
     # ── 새 Figure 생성 ──────────────────────────────────────────────────────
     fig = go.Figure()
@@ -494,8 +743,8 @@ def create_defect_overlaid_map(
     # ── 베이스 맵 trace 추가 ────────────────────────────────────────────────
     if base_map_type == "contour":
         fig.add_trace(go.Contour(
-            x=XI[0],
-            y=YI[:, 0],
+            x=xi,
+            y=yi,
             z=ZI,
             colorscale=colorscale,
             ncontours=n_contours,
@@ -513,8 +762,8 @@ def create_defect_overlaid_map(
     else:
         # 기본: Heatmap
         fig.add_trace(go.Heatmap(
-            x=XI[0],
-            y=YI[:, 0],
+            x=xi,
+            y=yi,
             z=ZI,
             colorscale=colorscale,
             zsmooth="best",
@@ -534,11 +783,8 @@ def create_defect_overlaid_map(
     add_wafer_outline(fig, radius)
 
     # ── 결함 traces 추가 ────────────────────────────────────────────────────
-    # @st.cache_data 함수 내부에서 pd.read_json으로 역직렬화
-    df_defect = pd.read_json(defect_df_json)
-
     defect_traces = _build_defect_traces(
-        df_defect=df_defect,
+        df_defect=_df_defect,
         selected_classes=selected_classes,
         wafer_radius=radius,
         show_outside=show_outside,
@@ -574,16 +820,17 @@ def create_defect_overlaid_map(
 
 
 # =============================================================================
-# [함수 6] _check_coord_mismatch (내부 헬퍼)
+# [함수 6] _coord_mismatch_for_key (내부 헬퍼)
 # =============================================================================
 
-def _check_coord_mismatch(
-    df_defect: pd.DataFrame,
+def _coord_mismatch_for_key(
+    file_key: tuple[str, int, int],
     wafer_radius: float,
     coord_scale: float,
 ) -> str | None:
     """
-    결함 좌표 범위와 웨이퍼 반지름을 비교하여 단위 불일치 경고 생성.
+    결함 좌표 범위와 웨이퍼 반지름을 비교하여 단위 불일치 경고 생성 (파일 단위 캐시).
+    좌표 리덕션은 파일당 1회 → 스케일·반지름 변경은 스칼라 비교만 다시 수행.
 
     [판단 기준]
     스케일 적용 후 결함 좌표의 최대 절댓값을 wafer_radius와 비교:
@@ -592,21 +839,33 @@ def _check_coord_mismatch(
     - 0.01 × radius ≤ max_abs ≤ 3 × radius: 정상 범위
 
     인자:
-        df_defect   : 표준화된 결함 DataFrame
+        file_key    : _defect_file_key 결과 (경로, mtime_ns, 크기) — stat 재호출 없음
         wafer_radius: 웨이퍼 반지름 (mm)
         coord_scale : 현재 적용 중인 스케일 팩터
 
     반환:
         str  : 경고 메시지 (문제 있을 때)
-        None : 정상 범위 (경고 없음)
+        None : 정상 범위 또는 빈 파일 (경고 없음)
     """
-    if df_defect is None or df_defect.empty:
+    max_abs = _coord_max_abs_cached(*file_key)
+    if max_abs is None:
         return None
+    return _coord_mismatch_message(abs(coord_scale) * max_abs, wafer_radius)
+
+
+def _coord_max_abs(df_defect: pd.DataFrame) -> float:
+    """
+    원본(스케일 전) 결함 좌표의 최대 절댓값.
+    |x·s|의 최댓값 = |s|·max(max x, -min x) → 스케일·abs 임시 배열 없이 min/max 리덕션만
+    (부호 비트 마스킹 abs는 버퍼 복사가 필요해 min/max 리덕션보다 느림)
+    """
+    xv = df_defect["x"].to_numpy()
+    yv = df_defect["y"].to_numpy()
+    return float(max(xv.max(), -xv.min(), yv.max(), -yv.min()))
 
-    scaled_x = df_defect["x"] * coord_scale
-    scaled_y = df_defect["y"] * coord_scale
-    max_abs   = max(scaled_x.abs().max(), scaled_y.abs().max())
 
+def _coord_mismatch_message(max_abs: float, wafer_radius: float) -> str | None:
+    """스케일 적용 후 좌표 최대 절댓값 → 단위 불일치 경고 문자열 (정상이면 None)."""
     if max_abs > 5.0 * wafer_radius:
         ratio = max_abs / wafer_radius
         return (
@@ -624,16 +883,130 @@ def _check_coord_mismatch(
     return None
 
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _coord_max_abs_cached(full_path: str, mtime_ns: int, size: int) -> float | None:
+    """원본 좌표 최대 절댓값 캐시 (키 = _load_defect_file_cached와 동일)."""
+    df = _load_defect_file_cached(full_path, mtime_ns, size)
+    if df is None or df.empty:
+        return None
+    return _coord_max_abs(df)
+
+
+# =============================================================================
+# [내부 헬퍼] _count_inside_wafer
+# =============================================================================
+
+def _count_inside_wafer(
+    x: np.ndarray,
+    y: np.ndarray,
+    wafer_radius: float,
+    coord_scale: float,
+) -> int:
+    """
+    스케일 적용 좌표 기준 웨이퍼 원 안쪽 결함 수.
+
+    (x·s)² + (y·s)² ≤ r² 를 원소 단위 단일 식으로 평가
+    - numexpr: 청크 단위 1패스 → 스케일/제곱/합 중간 배열 없음 (불리언 결과만)
+    - numpy 폴백: 스케일된 좌표 2개 + 불리언 마스크만 생성
+    _build_defect_traces의 원 필터와 같은 연산 순서 → 카운트와 표시 결함 수 일치
+    """
+    s  = float(coord_scale)
+    r2 = float(wafer_radius) * float(wafer_radius)
+    if _NUMEXPR_OK:
+        return int(np.count_nonzero(ne.evaluate(
+            "(x*s)*(x*s) + (y*s)*(y*s) <= r2",
+            local_dict={"x": x, "y": y, "s": s, "r2": r2},
+        )))
+    xs = x * s
+    ys = y * s
+    return int(np.count_nonzero(xs * xs + ys * ys <= r2))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _inside_count_cached(
+    full_path: str,
+    mtime_ns: int,
+    size: int,
+    wafer_radius: float,
+    coord_scale: float,
+) -> int:
+    """
+    _count_inside_wafer 캐시 (키 = 파일 키 + 반지름 + 스케일).
+    통계 패널은 매 rerun 표시되지만 값은 이 세 가지에만 의존 → 스케일·제곱·비교 패스는 조합당 1회.
+    """
+    df = _load_defect_file_cached(full_path, mtime_ns, size)
+    return _count_inside_wafer(
+        df["x"].to_numpy(), df["y"].to_numpy(), wafer_radius, coord_scale,
+    )
+
+
+# =============================================================================
+# [내부 헬퍼] _defect_table / 결함 테이블 CSV 캐시
+# =============================================================================
+
+def _defect_table(
+    df_defect: pd.DataFrame,
+    selected_classes,
+    coord_scale: float,
+    has_description: bool,
+) -> pd.DataFrame:
+    """
+    결함 데이터 테이블(expander 표시·CSV 다운로드 공용) — 선택 클래스 행, 스케일 적용 좌표.
+    반환 DataFrame은 새 객체 (공유 df_defect와 분리)
+    """
+    # 표시할 컬럼: x, y, class, size, description (있는 것만)
+    # (size·description은 로더가 항상 채움, description 유무는 파일 요약 캐시 값)
+    display_cols = ["x", "y", "class", "size"]
+    if has_description:
+        display_cols.append("description")
+
+    # 클래스 코드 룩업 테이블(카테고리 수 + 1, 마지막 = 코드 -1) → 행 위치 → 필요한 컬럼만 iloc 1회
+    # iloc 결과 = 새 DataFrame (공유 df_defect와 분리 → 별도 copy·reset_index 복사 불필요)
+    class_cat = df_defect["class"].array
+    selected_lut = np.zeros(len(class_cat.categories) + 1, dtype=bool)
+    selected_lut[class_cat.categories.get_indexer(list(selected_classes))] = True
+    rows = np.flatnonzero(selected_lut[class_cat.codes])
+    table = df_defect.iloc[rows, df_defect.columns.get_indexer(display_cols)]
+    table.index = pd.RangeIndex(rows.size)
+
+    # 스케일 적용 후 좌표로 표시 (원본 단위가 아닌 mm 단위로 표시)
+    if abs(coord_scale - 1.0) > 1e-10:
+        table["x"] = np.round(table["x"].to_numpy(dtype=np.float64) * coord_scale, 3)
+        table["y"] = np.round(table["y"].to_numpy(dtype=np.float64) * coord_scale, 3)
+    return table
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _defect_table_csv_cached(
+    full_path: str,
+    mtime_ns: int,
+    size: int,
+    selected_classes: tuple,
+    coord_scale: float,
+) -> bytes | None:
+    """
+    다운로드 버튼 data는 클릭 여부와 무관하게 rerun마다 전달됨
+    → to_csv 인코딩을 (파일, 클래스 선택, 스케일) 조합당 1회로 제한.
+    """
+    summary = _class_summary_cached(full_path, mtime_ns, size)
+    if summary is None:
+        return None
+    df = _load_defect_file_cached(full_path, mtime_ns, size)
+    table = _defect_table(df, selected_classes, coord_scale, summary[2])
+    return table.to_csv(index=False).encode("utf-8")
+
+
 # =============================================================================
 # [함수 7] render_defect_tab (UI 렌더러)
 # =============================================================================
 
 def render_defect_tab(
-    wafer_df_json: str,
+    wafer_df_blob: bytes,
     wafer_radius: float,
     resolution: int,
     colorscale: str,
     data_folder: str,
+    wafer_fp: str = None,
 ) -> None:
     """
     결함 오버레이 탭의 전체 UI를 렌더링.
@@ -667,18 +1040,19 @@ def render_defect_tab(
     5. create_defect_overlaid_map 호출 → Figure 렌더링
 
     인자:
-        wafer_df_json : 현재 웨이퍼 측정 데이터 JSON (x, y, data 컬럼)
+        wafer_df_blob : 현재 웨이퍼 측정 데이터 Arrow IPC blob (x, y, data 컬럼)
         wafer_radius  : 웨이퍼 반지름 (mm) — get_wafer_grid로 계산된 값
         resolution    : 보간 해상도 (사이드바 슬라이더)
         colorscale    : 컬러스케일 이름 (사이드바 selectbox)
         data_folder   : 데이터 폴더 경로 (결함 파일 목록 수집용)
+        wafer_fp      : wafer_df_blob의 blob_fingerprint (없으면 맵 생성 시 계산)
     """
     # ── 결함 파일 목록 수집 ──────────────────────────────────────────────────
-    # data_folder에서 CSV, XLSX, XLS 파일 목록 수집
-    csv_files  = glob.glob(os.path.join(data_folder, "*.csv"))
-    xlsx_files = glob.glob(os.path.join(data_folder, "*.xlsx"))
-    xls_files  = glob.glob(os.path.join(data_folder, "*.xls"))
-    all_files  = sorted(csv_files + xlsx_files + xls_files)
+    # data_folder에서 CSV, XLSX, XLS 파일 목록 수집 (폴더 mtime 키 캐시 → rerun마다 재스캔 없음)
+    try:
+        all_files = _list_data_files(data_folder, os.stat(data_folder).st_mtime_ns)
+    except OSError:
+        all_files = []
 
     # 표시용 파일명 → 전체 경로 매핑 딕셔너리
     file_options: dict[str, str] = {os.path.basename(f): f for f in all_files}
@@ -750,12 +1124,14 @@ def render_defect_tab(
                 st.rerun()
 
             # ── 현재 로드된 파일 처리 ────────────────────────────────────
+            # 파일 키(경로, mtime_ns, 크기)는 rerun당 stat 1회 → 로드·요약·경고·CSV 캐시가 공유
             current_path = st.session_state.get(_SS_FILE, "")
-            if not current_path or not os.path.exists(current_path):
+            file_key = _defect_file_key(current_path) if current_path else None
+            if file_key is None:
                 st.info("📋 위에서 결함 파일을 선택하고 [파일 로드] 버튼을 눌러주세요.")
                 loaded_df = None
             else:
-                loaded_df = load_defect_file(current_path)
+                loaded_df = _load_defect_file_cached(*file_key)
 
                 if loaded_df is None:
                     st.error(
@@ -770,9 +1146,12 @@ def render_defect_tab(
                         f"— 총 {len(loaded_df):,}개 결함"
                     )
 
-                    # 좌표 불일치 경고
-                    mismatch_warning = _check_coord_mismatch(
-                        loaded_df, wafer_radius, coord_scale
+                    # 클래스 집계: 파일별 1회 (캐시 공유 객체, 수정 금지)
+                    class_counts, all_classes, has_description = _class_summary_cached(*file_key)
+
+                    # 좌표 불일치 경고 (좌표 리덕션은 파일당 1회, 이후 스칼라 비교만)
+                    mismatch_warning = _coord_mismatch_for_key(
+                        file_key, wafer_radius, coord_scale
                     )
                     if mismatch_warning:
                         st.warning(mismatch_warning)
@@ -783,16 +1162,10 @@ def render_defect_tab(
             st.markdown("##### 📊 결함 통계")
 
             total_count  = len(loaded_df)
-            class_counts = loaded_df["class"].value_counts()
             n_classes    = len(class_counts)
 
-            # 웨이퍼 내/외부 비율 계산
-            inside_mask  = (
-                (loaded_df["x"] * coord_scale) ** 2 +
-                (loaded_df["y"] * coord_scale) ** 2
-                <= wafer_radius ** 2
-            )
-            n_inside  = int(inside_mask.sum())
+            # 웨이퍼 내/외부 비율 계산 (파일·반지름·스케일 조합별 캐시)
+            n_inside  = _inside_count_cached(*file_key, wafer_radius, coord_scale)
             n_outside = total_count - n_inside
             inside_pct = (n_inside / total_count * 100) if total_count > 0 else 0.0
 
@@ -860,8 +1233,7 @@ def render_defect_tab(
     )
 
     # ── 클래스 필터 multiselect ───────────────────────────────────────────────
-    all_classes = sorted(loaded_df["class"].unique().tolist())
-
+    # 정렬된 클래스 목록: 파일 로드 시 _class_summary_cached로 1회 계산 (rerun마다 재스캔 없음)
     # 기본값: 전체 클래스 선택
     # 파일이 바뀌었을 때 session_state에 이전 파일의 클래스가 남아있을 수 있음
     # → 현재 파일의 클래스 목록에서만 유효한 값을 기본값으로 사용
@@ -898,48 +1270,31 @@ def render_defect_tab(
         ),
     )
 
-    # ── defect_df_json 생성 ──────────────────────────────────────────────────
-    # @st.cache_data 함수에 DataFrame을 직접 전달 불가 → JSON 직렬화
-    defect_df_json: str = loaded_df.to_json()
-
     # selected_classes를 tuple로 변환
-    # list는 hash() 불가 → @st.cache_data TypeError 발생
+    # list는 hash() 불가 → 캐시 키로 tuple 사용
     selected_classes_tuple: tuple[str, ...] = tuple(sorted(selected_classes_list))
 
     # ── 오버레이 맵 생성 및 렌더링 ───────────────────────────────────────────
     with st.spinner("결함 오버레이 맵 생성 중..."):
         fig = create_defect_overlaid_map(
-            wafer_df_json=wafer_df_json,
-            defect_df_json=defect_df_json,
+            wafer_df_blob=wafer_df_blob,
+            df_defect=loaded_df,
             selected_classes=selected_classes_tuple,
             resolution=resolution,
             colorscale=colorscale,
             base_map_type=base_map_type.lower(),
             show_outside=show_outside,
             coord_scale=coord_scale,
+            wafer_fp=wafer_fp,
+            defect_key=file_key,
         )
 
     st.plotly_chart(fig, use_container_width=True)
 
     # ── 결함 데이터 테이블 (expander) ────────────────────────────────────────
     with st.expander("📋 결함 데이터 테이블", expanded=False):
-        # 표시할 컬럼: x, y, class, size, description (있는 것만)
-        display_cols = ["x", "y", "class"]
-        if "size" in loaded_df.columns:
-            display_cols.append("size")
-        if "description" in loaded_df.columns and loaded_df["description"].ne("").any():
-            display_cols.append("description")
-
-        # 선택된 클래스만 필터링하여 표시
-        df_display = loaded_df[
-            loaded_df["class"].isin(selected_classes_list)
-        ][display_cols].reset_index(drop=True)
-
-        # 스케일 적용 후 좌표로 표시 (원본 단위가 아닌 mm 단위로 표시)
-        if abs(coord_scale - 1.0) > 1e-10:
-            df_display = df_display.copy()
-            df_display["x"] = (df_display["x"] * coord_scale).round(3)
-            df_display["y"] = (df_display["y"] * coord_scale).round(3)
+        # 선택된 클래스만 필터링 + 스케일 적용 좌표로 표시
+        df_display = _defect_table(loaded_df, selected_classes_tuple, coord_scale, has_description)
 
         st.dataframe(
             df_display,
@@ -962,10 +1317,11 @@ def render_defect_tab(
             f"({n_shown / n_total * 100:.1f}%)"
         )
 
-        # CSV 다운로드 버튼
+        # CSV 다운로드 버튼 (인코딩 결과는 파일·클래스 선택·스케일 조합별 캐시)
+        csv_bytes = _defect_table_csv_cached(*file_key, selected_classes_tuple, coord_scale)
         st.download_button(
             label="📥 결함 데이터 CSV 다운로드",
-            data=df_display.to_csv(index=False),
+            data=csv_bytes if csv_bytes is not None else df_display.to_csv(index=False),
             file_name="defect_data_filtered.csv",
             mime="text/csv",
             key="def_download_btn",
@@ -6,10 +6,14 @@
 # [설계 결정 근거]
 # =============================================================================
 #
-# ① compute_gpc_column 반환 타입: str (df.to_json())
+# ① compute_gpc_column 반환 타입: bytes (core.df_to_blob, Arrow IPC)
 #    이유: "x","y","data" 컬럼 구조로 반환하면
 #         create_2d_heatmap, calculate_stats 등 기존 함수와 직접 체인 호출 가능.
-#         @st.cache_data는 DataFrame 해시 불가 → JSON 문자열로 직렬화.
+#         입력 원본 df는 DataFrame 그대로 전달, 캐시 키는 app이 가진 원본 식별 키(df_key)
+#         (없으면 core._hash_df 전체 행 해시) → 매 rerun 원본 재해싱 없음
+#         → 매 rerun df_raw.to_json() 직렬화 + JSON 파싱 제거
+#         결과도 JSON 대신 Arrow IPC → 하위 함수의 read_json 파싱 제거 (blob_to_df가 그대로 복원)
+#         숫자형 컬럼(float/int)은 pd.to_numeric 재스캔 없이 float64 배열로 바로 사용
 #
 # ② cycle_mode="column" 시 0 나눔 방지
 #    df[cycle_col].replace(0, np.nan): 0인 사이클을 NaN으로 대체
@@ -21,8 +25,9 @@
 #    → render_gpc_tab에서 사전 검증 → 함수 미호출
 #    캐시 함수 내부에서도 방어적 처리: fixed_cycles <= 0 → NaN 반환
 #
-# ④ 반경별 이동 평균 (rolling 방식)
-#    sort_values("r") 후 rolling(window, center=True, min_periods=1)
+# ④ 반경별 이동 평균 (rolling(window, center=True, min_periods=1) 동일 의미)
+#    r 오름차순 정렬 인덱스(_prepare_gpc_arrays 캐시) 순서로 scipy uniform_filter1d 2회
+#    (값 합 / 유효 개수 — pandas rolling 엔진의 호출 오버헤드 없음)
 #    - center=True: 현재 점 기준 앞뒤 window/2 범위 → 인과성 위반이지만
 #      공간 데이터에서는 인과성 개념 없음 → 더 자연스러운 스무딩
 #    - min_periods=1: 양 끝에서 window 미만이어도 NaN 없이 계산
@@ -37,6 +42,17 @@
 # ⑥ create_2d_heatmap 재사용
 #    compute_gpc_column이 "x","y","data"(=GPC) 구조를 반환하므로
 #    기존 create_2d_heatmap에 그대로 전달 가능 → 코드 중복 없음
+#
+# ⑦ GPC 산출 / 구역 통계 단일 패스 (numba 선택 의존성)
+#    나눗셈 → 양수 마스크 → 좌표 NaN 행 제거를 한 루프에서 처리 (중간 배열 할당 없음)
+#    구역 통계도 정렬 순서 압축 + 구역별 개수/합을 한 루프 (_zone_pass_numba)
+#    numba 미설치 시 동일 결과의 numpy 벡터 연산으로 대체
+#
+# ⑧ 반경/구역 통계 단일 캐시 (_prepare_gpc_arrays)
+#    프로파일, 박스플롯, 요약 지표, CSV 다운로드가 같은 GPC blob을 사용
+#    → blob fingerprint 키로 (r, gpc, radius, zone_stats, 정렬 인덱스, 유효 위치)를 1회 계산 후 공유
+#    render_gpc_tab이 fingerprint를 1회 계산해 fp= 로 전달 → 하위 캐시가 blob 재해싱 없음
+#    프로파일/박스플롯 Figure도 core와 같은 fp 키 cache_resource (히트 시 pickle 복원 없음)
 # =============================================================================
 
 # ── 표준 라이브러리 ─────────────────────────────────────────────────────────
@@ -47,12 +63,27 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
-
-# ── wafer_app_global 핵심 함수 import ────────────────────────────────────────
-from app import _default_col_index  # 컬럼 기본값 탐색 헬퍼
-from app import \
+from scipy.ndimage import uniform_filter1d
+
+# numba: 선택 의존성 (미설치 시 numpy 벡터 연산으로 GPC 산출)
+try:
+    from numba import njit
+    _NUMBA_OK = True
+except ImportError:
+    _NUMBA_OK = False
+
+# ── core 핵심 함수 import ─────────────────────────────────────────────────
+from core import _FIG_CACHE_MAX  # cache_resource LRU 최대 항목 수
+from core import _SCATTERGL_MIN_POINTS  # 산점도 WebGL 전환 기준 (core 측정점 오버레이와 동일)
+from core import _default_col_index  # 컬럼 기본값 탐색 헬퍼
+from core import _hash_df  # DataFrame 전체 행 해시 (df_key 미지정 시 캐시 키)
+from core import blob_fingerprint  # GPC blob 캐시 키 (xxh3)
+from core import blob_to_arrays  # Arrow IPC blob → (x, y, data) 배열 (복사 없음)
+from core import blob_to_df  # Arrow IPC blob → DataFrame (레거시 JSON도 허용)
+from core import df_to_blob  # GPC 결과 DataFrame → Arrow IPC blob
+from core import \
     calculate_stats  # GPC 통계: Mean, Std, Uniformity(%), Range, No.Sites
-from app import create_2d_heatmap  # GPC Heatmap 시각화 (data 컬럼에 GPC 값 전달)
+from core import create_2d_heatmap  # GPC Heatmap 시각화 (data 컬럼에 GPC 값 전달)
 
 # =============================================================================
 # session_state 키 상수 (prefix: "gpc_")
@@ -75,6 +106,21 @@ _SS_EDGE_R    = "gpc_edge_ratio"     # 엣지 기준 반지름 비율 slider
 _CENTER_RATIO = 0.3   # r < radius × 0.3 → Center Zone
 _MID_RATIO    = 0.7   # radius×0.3 ≤ r < radius×0.7 → Mid Zone
                        # r ≥ radius × 0.7 → Edge Zone
+_ZONE_NAMES   = ("Center", "Mid", "Edge")   # 구역 표시/순회 순서 (중심 → 가장자리)
+
+# 반경 프로파일 원본 산점도 최대 포인트 수 (초과 시 반경 구간별 층화 표본)
+# 산점도는 추세선 아래 맥락 표시용 → 전체 전송 시 브라우저 렌더/hover만 느려짐
+_SCATTER_MAX_POINTS = 5000
+_SCATTER_BINS       = 500    # 층화 표본 반경 구간 수 (구간당 최대 _SCATTER_MAX_POINTS / _SCATTER_BINS개)
+
+# 이동 평균 추세선 최소 유효 포인트 수 (= 최소 window)
+# 미만이면 window가 전체를 덮어 전체 평균 수평선이 됨 → 추세선 생략 (구역 평균선으로 충분)
+_TREND_MIN_POINTS = 5
+
+# Plotly trace 배열 dtype: plotly ≥ 6은 numpy 배열을 base64 typed array로 전송
+# → float32면 전송 바이트 절반 (화면/hover 4자리 표시에는 float32 정밀도로 충분)
+# 통계(평균/표준편차/사분위수) 계산은 float64 원본 기준, 표시 배열만 변환
+_TRACE_DTYPE = np.float32
 
 # 구역별 배경 색상 (add_vrect fillcolor)
 _ZONE_COLORS = {
@@ -95,19 +141,19 @@ _ZONE_LINE_COLORS = {
 # [함수 1] compute_gpc_column
 # =============================================================================
 
-@st.cache_data
 def compute_gpc_column(
-    df_json: str,
+    df_raw: pd.DataFrame,
     x_col: str,
     y_col: str,
     thickness_col: str,
     cycle_mode: str,           # "column" 또는 "fixed"
     cycle_col: str | None,     # cycle_mode="column"일 때 사용
     fixed_cycles: int | None,  # cycle_mode="fixed"일 때 사용
-) -> str | None:
+    df_key=None,               # df_raw 내용 식별 키 (없으면 전체 행 해시)
+) -> bytes | None:
     """
     두께 데이터에서 GPC(Growth Per Cycle) 컬럼을 계산하고
-    표준 컬럼 구조("x","y","data"=GPC) JSON을 반환.
+    표준 컬럼 구조("x","y","data"=GPC) Arrow IPC blob을 반환.
 
     [반환 컬럼 구조]
     "x":    X 좌표 (wafer_app_global 표준)
@@ -124,26 +170,50 @@ def compute_gpc_column(
     음수 GPC = 측정 오류 또는 참조층 문제 → NaN으로 처리하여 맵에서 제외.
 
     [캐시 키 구성]
-    (df_json, x_col, y_col, thickness_col, cycle_mode, cycle_col, fixed_cycles)
-    - 모든 인자가 str, int, None → hashable → @st.cache_data 정상 작동
+    (df_key, x_col, y_col, thickness_col, cycle_mode, cycle_col, fixed_cycles)
+    - df_key: 호출부가 이미 가진 원본 식별 키 (app의 shared_df_raw_key)
+      → 매 rerun 원본 전체 행 해시(hash_pandas_object) 없이 캐시 조회
+      없으면 core._hash_df 전체 행 해시로 대체 (이전과 동일한 키 강도)
+    - df_raw 자체는 비해싱 인자(_df_raw)로만 전달 (캐시 미스 시에만 사용)
+    - 나머지 인자는 str, int, None → hashable
     - cycle_col: str | None → None도 hashable ✅
     - fixed_cycles: int | None → None도 hashable ✅
 
     인자:
-        df_json       : 원본 데이터 JSON (x_col, y_col, thickness_col 포함)
+        df_raw        : 원본 데이터 DataFrame (x_col, y_col, thickness_col 포함)
         x_col         : X 좌표 컬럼명
         y_col         : Y 좌표 컬럼명
         thickness_col : 두께 측정값 컬럼명 (Å 또는 nm 단위)
         cycle_mode    : "column" (컬럼으로 나누기) 또는 "fixed" (고정값으로 나누기)
         cycle_col     : cycle_mode="column" 시 사용할 사이클 수 컬럼명
         fixed_cycles  : cycle_mode="fixed" 시 사용할 고정 사이클 수 (양의 정수)
+        df_key        : df_raw 내용이 같으면 같은 값인 hashable 키 (None이면 전체 행 해시)
 
     반환:
-        str  : "x","y","data" 컬럼 구조의 df.to_json() 문자열
+        bytes: "x","y","data" 컬럼 구조의 Arrow IPC blob (core.df_to_blob)
         None : 계산 실패 (cycle_col 없음, fixed_cycles ≤ 0 등)
     """
-    # ── 캐시 함수 진입: JSON → DataFrame 역직렬화 ───────────────────────────
-    df = pd.read_json(df_json)
+    if df_key is None:
+        df_key = (_hash_df(df_raw).hex() if isinstance(df_raw, pd.DataFrame)
+                  else blob_fingerprint(df_raw))
+    return _gpc_column_by_key(df_key, x_col, y_col, thickness_col,
+                              cycle_mode, cycle_col, fixed_cycles, df_raw)
+
+
+@st.cache_data(show_spinner=False)
+def _gpc_column_by_key(
+    df_key,
+    x_col: str,
+    y_col: str,
+    thickness_col: str,
+    cycle_mode: str,
+    cycle_col: str | None,
+    fixed_cycles: int | None,
+    _df_raw: pd.DataFrame,
+) -> bytes | None:
+    """compute_gpc_column 본체. 캐시 키 = (df_key, 컬럼/사이클 설정). 반환 bytes → 히트 시 복원 비용 미미."""
+    # ── DataFrame 그대로 사용 (레거시 JSON/blob 인자도 blob_to_df로 허용) ──────
+    df = blob_to_df(_df_raw)
 
     # ── 필수 컬럼 존재 확인 ──────────────────────────────────────────────────
     required = [x_col, y_col, thickness_col]
@@ -153,7 +223,7 @@ def compute_gpc_column(
         return None
 
     # ── 두께 값 추출 및 숫자형 변환 ─────────────────────────────────────────
-    thickness = pd.to_numeric(df[thickness_col], errors="coerce")
+    thickness = _numeric_values(df[thickness_col])
 
     # ── GPC 계산 분기 ─────────────────────────────────────────────────────────
     if cycle_mode == "column":
@@ -161,14 +231,8 @@ def compute_gpc_column(
         if cycle_col is None or cycle_col not in df.columns:
             return None
 
-        cycles_raw = pd.to_numeric(df[cycle_col], errors="coerce")
-
-        # ★ 0 나눔 방지: replace(0, np.nan)
-        #   pandas 나눗셈에서 NaN 나누기 = NaN (ZeroDivisionError 없음)
-        # ★ 음수 사이클 방지: 물리적으로 사이클 수는 양수만 유효
-        cycles_safe = cycles_raw.where(cycles_raw > 0, other=np.nan)
-
-        gpc = thickness / cycles_safe
+        cycles = _numeric_values(df[cycle_col])
+        fixed  = 0.0
 
     elif cycle_mode == "fixed":
         # 고정값으로 나누기: 표준 ALD (전체 웨이퍼에 동일 사이클 수 적용)
@@ -177,40 +241,100 @@ def compute_gpc_column(
             # fixed_cycles<0: 물리적 불가
             return None
 
-        gpc = thickness / float(fixed_cycles)
+        cycles = thickness   # fixed > 0이면 참조하지 않음 (자리 채움)
+        fixed  = float(fixed_cycles)
 
     else:
         # 알 수 없는 cycle_mode
         return None
 
-    # ── 음수/비정상 GPC 값 NaN 처리 ──────────────────────────────────────────
-    # GPC는 물리적으로 반드시 양수 (음수 = 측정 오류 또는 참조층 편차)
-    # np.nan은 get_wafer_grid에서 NaN 마스크와 함께 처리됨 → 맵에서 자동 제외
-    gpc = gpc.where(gpc > 0, other=np.nan)
-
-    # ── 표준 컬럼 구조 DataFrame 생성 ────────────────────────────────────────
+    # ── GPC 산출 + 좌표 NaN 행 제거 ──────────────────────────────────────────
     # "x","y","data" 구조: wafer_app_global의 모든 시각화 함수와 호환
-    result_df = pd.DataFrame({
-        "x":    pd.to_numeric(df[x_col], errors="coerce").values,
-        "y":    pd.to_numeric(df[y_col], errors="coerce").values,
-        "data": gpc.values,
-    }).dropna(subset=["x", "y"]).reset_index(drop=True)
-    # data(GPC) NaN은 dropna에서 제외하지 않음 → get_wafer_grid가 처리
-
-    if result_df.empty:
+    # data(GPC) NaN은 제외하지 않음 → get_wafer_grid가 처리 (좌표 NaN 행만 제거)
+    x = _numeric_values(df[x_col])
+    y = _numeric_values(df[y_col])
+    if _NUMBA_OK:
+        x, y, gpc = _gpc_numba(x, y, thickness, cycles, fixed)
+    else:
+        x, y, gpc = _gpc_numpy(x, y, thickness, cycles, fixed)
+    if x.size == 0:
         return None
 
-    return result_df.to_json()
+    result_df = pd.DataFrame({"x": x, "y": y, "data": gpc}, copy=False)
+    return df_to_blob(result_df)
+
+
+def _gpc_numpy(x, y, thickness, cycles, fixed) -> tuple:
+    """numba 미설치 폴백: _gpc_numba와 동일 결과의 벡터 연산."""
+    if fixed > 0:
+        # 고정 사이클: 스칼라 나눗셈 1회 (NaN 선채움 불필요)
+        gpc = thickness / fixed
+    else:
+        # ★ 0 나눔 방지: 0 이하 사이클은 나누지 않음 → NaN 유지 (사이클 NaN 배열 할당 없음)
+        # ★ 음수 사이클 방지: 물리적으로 사이클 수는 양수만 유효
+        gpc = np.full(thickness.shape, np.nan)
+        np.divide(thickness, cycles, out=gpc, where=cycles > 0)
+
+    # GPC는 물리적으로 반드시 양수 (음수 = 측정 오류 또는 참조층 편차) → NaN
+    gpc[gpc <= 0] = np.nan
+
+    keep = ~(np.isnan(x) | np.isnan(y))
+    return x[keep], y[keep], gpc[keep]
+
+
+if _NUMBA_OK:
+    @njit(cache=True)
+    def _gpc_numba(x, y, thickness, cycles, fixed):
+        """
+        (x, y, GPC) 단일 패스. fixed > 0이면 고정 사이클, 아니면 cycles[i] 사용.
+        0 이하 사이클·양수 아닌 GPC → NaN, 좌표 NaN 행은 건너뛰며 앞으로 압축.
+        fixed > 0 분기는 루프 불변 → LLVM이 루프 밖으로 분리 (고정 모드 전용 커널과 실측 동일)
+        """
+        n  = x.shape[0]
+        xo = np.empty(n)
+        yo = np.empty(n)
+        go = np.empty(n)
+        k  = 0
+        for i in range(n):
+            if np.isnan(x[i]) or np.isnan(y[i]):
+                continue
+            c = fixed if fixed > 0 else cycles[i]
+            g = thickness[i] / c if c > 0 else np.nan
+            if not g > 0:
+                g = np.nan
+            xo[k] = x[i]
+            yo[k] = y[i]
+            go[k] = g
+            k += 1
+        return xo[:k], yo[:k], go[:k]
+
+
+def _numeric_values(col: pd.Series) -> np.ndarray:
+    """
+    컬럼 → float64 ndarray. 숫자형(float/int)은 pd.to_numeric 재스캔 없이 바로 변환,
+    그 외(object 등)만 to_numeric(errors="coerce")로 숫자 아닌 값 NaN 처리.
+    """
+    if col.dtype.kind not in "fiu":
+        col = pd.to_numeric(col, errors="coerce")
+    return col.to_numpy(dtype=np.float64, na_value=np.nan)
 
 
 # =============================================================================
-# [내부 헬퍼] _compute_zone_stats
+# [내부 헬퍼] _zone_bounds / _compute_zone_stats
 # =============================================================================
 
+def _zone_bounds(radius: float) -> tuple:
+    """구역별 (이름, 시작 반경, 끝 반경) 튜플 — 구역 배경, 평균선, 구역 통계가 같은 경계를 공유."""
+    r_c = radius * _CENTER_RATIO
+    r_m = radius * _MID_RATIO
+    return (("Center", 0, r_c), ("Mid", r_c, r_m), ("Edge", r_m, radius))
+
+
 def _compute_zone_stats(
     r: np.ndarray,
     gpc: np.ndarray,
     radius: float,
+    order: np.ndarray = None,
 ) -> dict[str, dict]:
     """
     3구역(Center/Mid/Edge)별 GPC 통계를 계산.
@@ -224,38 +348,205 @@ def _compute_zone_stats(
         r      : 각 측정 포인트의 반경 배열 (mm)
         gpc    : 각 측정 포인트의 GPC 값 배열
         radius : 웨이퍼 최대 반경 (mm)
+        order  : r 오름차순 정렬 인덱스 (없으면 여기서 argsort)
 
     반환:
-        {"Center": {"mean": ..., "std": ..., "data": ...}, "Mid": ..., "Edge": ...}
+        {"Center": {"mean": ..., "std": ..., "data": ...}, "Mid": ..., "Edge": ...,
+         "All": 전체 유효값 통계 (구역 개수/평균/표준편차에서 합성 — 배열 재스캔 없음)}
+        "data"는 반경 오름차순 (원래 행 순서 아님)
+        "All"의 "idx": 유효값의 정렬 순서상 위치 (gpc[order][idx] == data)
     """
-    center_mask = r <  radius * _CENTER_RATIO
-    mid_mask    = (r >= radius * _CENTER_RATIO) & (r < radius * _MID_RATIO)
-    edge_mask   = r >= radius * _MID_RATIO
+    # r 정렬 순서로 재배치 → 구역 = 연속 구간 → 구역 배열은 슬라이스 view (복사 없음)
+    # 구역 배열에는 NaN 없음 → nanmean/nanstd 대신 mean/std
+    if order is None:
+        order = np.argsort(r, kind="stable")
+    (_, _, r_c), (_, _, r_m), _ = _zone_bounds(radius)
+    zone_pass = _zone_pass_numba if _NUMBA_OK else _zone_pass_numpy
+    g_s, pos, counts, means, stds = zone_pass(r, gpc, order, r_c, r_m)
 
     zones = {}
-    for zone_name, mask in [("Center", center_mask),
-                              ("Mid",    mid_mask),
-                              ("Edge",   edge_mask)]:
-        zone_gpc = gpc[mask & ~np.isnan(gpc)]
+    lo = 0
+    for z, zone_name in enumerate(_ZONE_NAMES):
+        hi = lo + int(counts[z])
         zones[zone_name] = {
-            "data":  zone_gpc,
-            "mean":  float(np.nanmean(zone_gpc)) if len(zone_gpc) > 0 else np.nan,
-            "std":   float(np.nanstd(zone_gpc))  if len(zone_gpc) > 0 else np.nan,
-            "count": int(len(zone_gpc)),
+            "data":  g_s[lo:hi],
+            "mean":  float(means[z]) if hi > lo else np.nan,
+            "std":   float(stds[z])  if hi > lo else np.nan,
+            "count": hi - lo,
         }
+        lo = hi
+
+    # 전체 통계: 구역 결과 합성 (평균 = 가중 평균, 분산 = 구역 내 분산 + 구역 평균 편차)
+    # → 전체 평균 기준선용 nanmean 추가 스캔 없음
+    n_all = lo
+    if n_all > 0:
+        filled = counts > 0
+        w      = counts[filled]
+        mean   = float(np.dot(w, means[filled])) / n_all
+        var    = float(np.dot(w, stds[filled] ** 2 + (means[filled] - mean) ** 2)) / n_all
+        all_mean, all_std = mean, var ** 0.5
+    else:
+        all_mean = all_std = np.nan
+    zones["All"] = {"data": g_s, "mean": all_mean, "std": all_std, "count": n_all, "idx": pos}
 
     return zones
 
 
+def _zone_pass_numpy(r, gpc, order, r_c, r_m) -> tuple:
+    """
+    numba 미설치 폴백: _zone_pass_numba와 동일 결과.
+    유효값 인덱스 1회 (np.isfinite) → searchsorted 2회로 구역 경계 → 슬라이스별 mean/std
+    (합/제곱합 reduceat은 std 수치 안정성이 떨어지고 빈 구역 처리가 별도로 필요)
+    """
+    g_s = gpc[order]
+    pos = np.flatnonzero(np.isfinite(g_s))
+    r_s = r[order[pos]]
+    g_s = g_s[pos]
+    i_c, i_m = np.searchsorted(r_s, (r_c, r_m))
+    counts = np.diff((0, i_c, i_m, g_s.size))
+    means = np.full(3, np.nan)
+    stds  = np.full(3, np.nan)
+    for z, (lo, hi) in enumerate(((0, i_c), (i_c, i_m), (i_m, g_s.size))):
+        if hi > lo:
+            means[z] = g_s[lo:hi].mean()
+            stds[z]  = g_s[lo:hi].std()
+    return g_s, pos, counts, means, stds
+
+
+if _NUMBA_OK:
+    @njit(cache=True)
+    def _zone_pass_numba(r, gpc, order, r_c, r_m):
+        """
+        r 정렬 순서로 유효 GPC 압축 + 구역별 개수/합을 한 루프에서 계산, 이어서 구역 슬라이스별 편차 제곱합.
+        (numpy 경로의 gather 3회·isfinite·flatnonzero·searchsorted·mean/std 6회 스캔 → 순차 2패스)
+        구역 번호 = (r ≥ r_c) + (r ≥ r_m) 분기 없는 비교 합. std는 평균 기준 2패스 (합/제곱합보다 안정)
+        """
+        n      = order.shape[0]
+        g_s    = np.empty(n)
+        pos    = np.empty(n, np.int64)
+        counts = np.zeros(3, np.int64)
+        sums   = np.zeros(3)
+        k      = 0
+        for j in range(n):
+            i = order[j]
+            g = gpc[i]
+            if not np.isfinite(g):
+                continue
+            z = (r[i] >= r_c) + (r[i] >= r_m)
+            counts[z] += 1
+            sums[z]   += g
+            g_s[k] = g
+            pos[k] = j
+            k += 1
+
+        means = np.full(3, np.nan)
+        stds  = np.full(3, np.nan)
+        lo = 0
+        for z in range(3):
+            hi = lo + counts[z]
+            if hi > lo:
+                m  = sums[z] / counts[z]
+                ss = 0.0
+                for t in range(lo, hi):
+                    d   = g_s[t] - m
+                    ss += d * d
+                means[z] = m
+                stds[z]  = np.sqrt(ss / counts[z])
+            lo = hi
+        return g_s[:k], pos[:k], counts, means, stds
+
+
+# =============================================================================
+# [내부 헬퍼] _prepare_gpc_arrays
+# =============================================================================
+
+def _prepare_gpc_arrays(gpc_blob: bytes, fp: str = None) -> tuple:
+    """
+    GPC blob → (r, gpc, radius, zone_stats, order, valid_idx). 반경/구역 통계의 단일 출처.
+    프로파일·박스플롯·요약 지표·CSV가 같은 blob에 대해 sqrt/구역 마스크를 각자 재계산하지 않도록
+    blob fingerprint로 1회만 계산해 공유.
+    fp: blob_fingerprint 결과 (없으면 여기서 계산)
+    ⚠️ 반환 배열은 캐시 공유 객체 (읽기 전용) → 수정 필요 시 복사 후 사용
+    """
+    return _gpc_arrays_by_fp(fp or blob_fingerprint(gpc_blob), gpc_blob)
+
+
+@st.cache_resource(show_spinner=False, max_entries=_FIG_CACHE_MAX)
+def _gpc_arrays_by_fp(fp: str, _gpc_blob: bytes) -> tuple:
+    """
+    _prepare_gpc_arrays 본체. 캐시 키 = blob fingerprint.
+    order: r 오름차순 정렬 인덱스 (이동 평균용, stable → 동일 반경은 원래 순서 유지)
+    valid_idx: order 기준 유효(유한) GPC 위치 — 구역 통계 패스에서 같이 구함 (산점도가 NaN 재스캔 없이 사용)
+    """
+    x, y, gpc = blob_to_arrays(_gpc_blob)
+    # 반경: 버퍼 1개에 제곱합 → 제자리 sqrt (x**2, y**2, 합 임시 배열 3개 없음)
+    # np.hypot은 오버플로 방지 스케일링 때문에 측정 시 3~5배 느림 → 좌표(mm) 범위에선 불필요
+    r = x * x
+    r += y * y
+    np.sqrt(r, out=r)
+    radius = float(r.max()) if r.size > 0 else np.nan
+    order = np.argsort(r, kind="stable")
+    zone_stats = _compute_zone_stats(r, gpc, radius, order)
+
+    # 공유 객체 보호: 호출부의 제자리 수정이 다른 세션/차트로 새지 않도록 쓰기 금지
+    valid_idx = zone_stats["All"]["idx"]
+    for arr in (r, gpc, order, valid_idx, *(zs["data"] for zs in zone_stats.values())):
+        arr.setflags(write=False)
+    return r, gpc, radius, zone_stats, order, valid_idx
+
+
+def _centered_nanmean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    pd.Series(values).rolling(window, center=True, min_periods=1).mean()과 같은 결과.
+    NaN 제외 합은 uniform_filter1d(mode="constant", 0 패딩), 유효 개수는 정수 누적합 차분
+    → 양 끝 window 미만 구간도 유효 값만으로 평균 (min_periods=1), 전부 NaN이면 NaN.
+    (개수까지 uniform_filter1d로 구하면 이동 합 잔차 때문에 전부 NaN 구간이 0이 아닌
+     합 / 정확히 0인 개수 → inf가 됨 → 개수는 정확한 정수로 판정)
+    """
+    n = values.size
+    valid = ~np.isnan(values)
+    num = uniform_filter1d(np.where(valid, values, 0.0), window, mode="constant")
+
+    # uniform_filter1d 창 위치와 동일: [i - window//2, i - window//2 + window)
+    csum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid, out=csum[1:])
+    lo = np.arange(-(window // 2), n - window // 2)
+    hi = np.clip(lo + window, 0, n)
+    np.clip(lo, 0, n, out=lo)
+    count = csum[hi] - csum[lo]
+
+    out = np.full(n, np.nan)
+    np.divide(num * window, count, out=out, where=count > 0)
+    return out
+
+
+def _stratified_sample(r_sorted: np.ndarray, radius: float) -> np.ndarray:
+    """
+    반경 구간(_SCATTER_BINS개 등간격)별로 최대 _SCATTER_MAX_POINTS / _SCATTER_BINS개씩 뽑은 위치.
+    r_sorted는 반경 오름차순 → 구간 = 연속 구간 (searchsorted로 경계만 구함, 추가 정렬 없음)
+    → 구간 내 등간격 계통 추출 (Python 루프·난수 없음, 같은 입력이면 같은 표본).
+    성긴 구간(중심부)은 전부 유지, 조밀한 구간(가장자리)만 솎아냄. 반환은 r_sorted 기준 오름차순 위치.
+    """
+    per_bin = max(1, _SCATTER_MAX_POINTS // _SCATTER_BINS)
+    edges  = np.linspace(0.0, radius, _SCATTER_BINS + 1)[1:-1]
+    bounds = np.concatenate(([0], np.searchsorted(r_sorted, edges), [r_sorted.size]))
+    starts = bounds[:-1]
+    counts = np.diff(bounds)
+    take   = np.minimum(counts, per_bin)
+    bin_of = np.repeat(np.arange(take.size), take)
+    rank   = np.arange(bin_of.size) - np.repeat(np.cumsum(take) - take, take)
+    return starts[bin_of] + rank * counts[bin_of] // take[bin_of]
+
+
 # =============================================================================
 # [함수 2] create_gpc_radial_profile
 # =============================================================================
 
-@st.cache_data
 def create_gpc_radial_profile(
-    df_json: str,
+    df_blob: bytes,
     window: int = 20,
     unit: str = "Å/cycle",
+    fp: str = None,
 ) -> go.Figure:
     """
     반경별 GPC 프로파일 차트 생성.
@@ -264,90 +555,106 @@ def create_gpc_radial_profile(
     1. 배경 구역 색상 (add_vrect):
        Center(0~0.3R): 연초록, Mid(0.3R~0.7R): 연노랑, Edge(0.7R~R): 연빨강
     2. 원본 산점도 (반투명 회색): 측정 노이즈 포함된 원본 데이터
-    3. 이동 평균 추세선 (진한 색): rolling 스무딩으로 전반적 경향 표시
+    3. 이동 평균 추세선 (진한 색): 중앙 이동 평균 스무딩으로 전반적 경향 표시
     4. 구역별 평균 수평 점선: 각 구역의 대표 GPC 값
 
     [이동 평균 처리]
-    df.sort_values("r") 후 rolling(window, center=True, min_periods=1)
+    r 정렬 인덱스(_prepare_gpc_arrays) 순서로 _centered_nanmean
+    (= rolling(window, center=True, min_periods=1).mean())
     - center=True: 각 점의 앞뒤를 동등하게 반영 (공간 데이터에서 적합)
     - min_periods=1: 양 끝에서 window 미만이어도 NaN 없이 계산
-    - window 자동 조정: len(df) × 0.1 기준, 5~25 클리핑
+    - window 자동 조정: 포인트 수 × 0.1 기준, 5~25 클리핑
+    - 유효 포인트 _TREND_MIN_POINTS(5) 미만: 추세선 생략 (전체 평균 수평선과 구분 불가)
 
     [add_vrect 선택 이유]
     add_shape으로 fillrect를 그리는 것보다 add_vrect이 더 간결하고
     paper/data 좌표 자동 처리로 x축 범위 변경 시에도 자동 반영됨.
 
     인자:
-        df_json: "x","y","data"(=GPC) 컬럼의 JSON (compute_gpc_column 반환값)
+        df_blob: "x","y","data"(=GPC) 컬럼의 Arrow IPC blob (compute_gpc_column 반환값)
         window : 이동 평균 window 크기 (측정 포인트 수 기준 자동 조정)
         unit   : GPC 단위 표기 (Y축 라벨에 사용)
+        fp     : blob_fingerprint 결과 (없으면 여기서 계산)
 
     반환:
         go.Figure: 반경별 GPC 프로파일 Figure
+        ⚠️ cache_resource 공유 객체 → 수정 필요 시 go.Figure(fig)로 복사 후 사용
     """
-    df = pd.read_json(df_json)
+    fp = fp or blob_fingerprint(df_blob)
+    return _radial_profile_by_fp(fp, window, unit, df_blob)
 
-    # ── 반경 계산 ─────────────────────────────────────────────────────────────
-    df["r"] = np.sqrt(df["x"] ** 2 + df["y"] ** 2)
-    radius  = df["r"].max()
 
-    # GPC 값 (NaN 포함 가능)
-    gpc_vals = df["data"].values
-    r_vals   = df["r"].values
-
-    # ── 구역별 통계 계산 ──────────────────────────────────────────────────────
-    zone_stats = _compute_zone_stats(r_vals, gpc_vals, radius)
+@st.cache_resource(show_spinner=False, max_entries=_FIG_CACHE_MAX)
+def _radial_profile_by_fp(fp: str, window: int, unit: str, _df_blob: bytes) -> go.Figure:
+    """create_gpc_radial_profile 본체. 캐시 키 = (fp, window, unit)."""
+    # ── 반경 / 구역별 통계 (blob 단위 공유 캐시) ─────────────────────────────
+    # GPC 값은 NaN 포함 가능
+    r_vals, gpc_vals, radius, zone_stats, order, valid_idx = _prepare_gpc_arrays(_df_blob, fp)
 
     # ── 이동 평균 계산 ────────────────────────────────────────────────────────
-    # 반드시 r 기준 정렬 후 rolling → 정렬 없이 rolling하면 의미 없는 순서 평균
-    df_sorted = df.sort_values("r").reset_index(drop=True)
+    # 반드시 r 기준 정렬 후 이동 평균 → 정렬 없이 평균하면 의미 없는 순서 평균
+    # 캐시된 order로 필요한 두 배열만 재배치 (DataFrame 정렬·복사 없음) → 추세선·산점도가 공유
+    r_sorted = r_vals[order]
+    g_sorted = gpc_vals[order]
 
+    # 유효 포인트가 _TREND_MIN_POINTS 미만이면 추세선 생략 (이동 평균 계산 자체를 건너뜀)
     # window 자동 조정: 포인트 수 × 10% 기준, [5, 25] 클리핑
     # 포인트가 적으면 window가 크면 전체가 하나의 평균으로 뭉개짐 → 자동 축소
-    auto_window = max(5, min(25, int(len(df_sorted) * 0.1), window))
+    if valid_idx.size < _TREND_MIN_POINTS:
+        rolling_mean = None
+    else:
+        auto_window  = max(_TREND_MIN_POINTS, min(25, r_sorted.size // 10, window))
+        rolling_mean = _centered_nanmean(g_sorted, auto_window)
 
-    rolling_mean = (
-        df_sorted["data"]
-        .rolling(window=auto_window, center=True, min_periods=1)
-        .mean()
-    )
+    # ── 도형/주석은 리스트로 모아 Figure 생성 시 1회 전달 ──────────────────────
+    # add_vrect/add_shape/add_annotation 호출마다 layout 검증·복사 반복 → 리스트 1회 검증
+    # (구역 평균선은 구역마다 색이 달라 단일 trace로 합칠 수 없음 → shape 유지)
+    shapes      = []
+    annotations = []
 
-    # ── Figure 생성 ───────────────────────────────────────────────────────────
-    fig = go.Figure()
-
-    # ── 구역 배경 (add_vrect) ─────────────────────────────────────────────────
-    # x0, x1은 data 좌표 (반경, mm)
+    # ── 구역 배경 (add_vrect와 같은 rect shape + 좌상단 라벨) ──────────────────
+    # x0, x1은 data 좌표 (반경, mm), y는 plot 영역 전체 (y domain 0~1)
     # layer="below": Heatmap보다 아래에 배치 → scatter가 배경 위에 렌더링
-    zone_boundaries = [
-        ("Center", 0,                       radius * _CENTER_RATIO),
-        ("Mid",    radius * _CENTER_RATIO,   radius * _MID_RATIO),
-        ("Edge",   radius * _MID_RATIO,      radius),
-    ]
-
-    for zone_name, x0, x1 in zone_boundaries:
-        fig.add_vrect(
-            x0=x0,
-            x1=x1,
+    zone_bounds = _zone_bounds(radius)
+
+    for zone_name, x0, x1 in zone_bounds:
+        shapes.append(dict(
+            type="rect",
+            x0=x0, x1=x1, xref="x",
+            y0=0, y1=1, yref="y domain",
             fillcolor=_ZONE_COLORS[zone_name],
             opacity=1.0,       # fillcolor 자체에 투명도 포함 (rgba)
-            line_width=0,      # 구역 경계선 없음 (자연스러운 전환)
+            line=dict(width=0),  # 구역 경계선 없음 (자연스러운 전환)
             layer="below",     # 데이터 포인트 아래에 배경으로 배치
-            annotation_text=zone_name,
-            annotation_position="top left",
-            annotation=dict(
-                font=dict(size=10, color="gray"),
-                opacity=0.7,
-            ),
-        )
+        ))
+        annotations.append(dict(
+            text=zone_name,
+            x=x0, xref="x", xanchor="left",
+            y=1, yref="y domain", yanchor="top",
+            showarrow=False,
+            font=dict(size=10, color="gray"),
+            opacity=0.7,
+        ))
 
     # ── 원본 산점도 (반투명): 측정 노이즈 포함 원본 ──────────────────────────
     # 모든 포인트를 반투명 회색으로 → "이 아래에 데이터가 있다"는 맥락 제공
-    valid_mask = ~np.isnan(gpc_vals)
-    fig.add_trace(go.Scatter(
-        x=r_vals[valid_mask],
-        y=gpc_vals[valid_mask],
+    # 포인트가 많으면 반경 구간별 층화 표본만 전송 (이동평균/구역 통계는 전체 데이터 기준)
+    # 정렬 배열 기준 유효 위치는 구역 통계 패스에서 이미 구함 (NaN 재스캔 없음)
+    # → x/y 두 trace 배열이 같은 정수 인덱스 재사용
+    n_valid = valid_idx.size
+    if n_valid > _SCATTER_MAX_POINTS:
+        valid_idx = valid_idx[_stratified_sample(r_sorted[valid_idx], radius)]
+    scatter_name = (
+        "원본 데이터" if valid_idx.size == n_valid
+        else f"원본 데이터 (표본 {valid_idx.size:,}/{n_valid:,})"
+    )
+    # 많은 점은 WebGL(Scattergl) → SVG DOM 노드 없이 hover/zoom. 소량은 SVG가 초기화 비용이 더 적음
+    scatter_cls = go.Scattergl if valid_idx.size > _SCATTERGL_MIN_POINTS else go.Scatter
+    traces = [scatter_cls(
+        x=r_sorted[valid_idx].astype(_TRACE_DTYPE),
+        y=g_sorted[valid_idx].astype(_TRACE_DTYPE),
         mode="markers",
-        name="원본 데이터",
+        name=scatter_name,
         marker=dict(
             size=4,
             color="rgba(150, 150, 150, 0.40)",   # 반투명 회색
@@ -358,33 +665,29 @@ def create_gpc_radial_profile(
             "반경: %{x:.2f} mm<br>"
             f"GPC: %{{y:.4f}} {unit}<extra>원본</extra>"
         ),
-    ))
+    )]
 
     # ── 이동 평균 추세선: 전반적 반경-GPC 경향 ───────────────────────────────
-    fig.add_trace(go.Scatter(
-        x=df_sorted["r"].values,
-        y=rolling_mean.values,
-        mode="lines",
-        name=f"이동평균 (window={auto_window})",
-        line=dict(color="royalblue", width=2.5),
-        showlegend=True,
-        hovertemplate=(
-            "반경: %{x:.2f} mm<br>"
-            f"이동평균 GPC: %{{y:.4f}} {unit}<extra>이동평균</extra>"
-        ),
-    ))
+    if rolling_mean is not None:
+        traces.append(go.Scatter(
+            x=r_sorted.astype(_TRACE_DTYPE),
+            y=rolling_mean.astype(_TRACE_DTYPE),
+            mode="lines",
+            name=f"이동평균 (window={auto_window})",
+            line=dict(color="royalblue", width=2.5),
+            showlegend=True,
+            hovertemplate=(
+                "반경: %{x:.2f} mm<br>"
+                f"이동평균 GPC: %{{y:.4f}} {unit}<extra>이동평균</extra>"
+            ),
+        ))
 
     # ── 구역별 평균 수평 점선 ─────────────────────────────────────────────────
     # 각 구역의 대표 GPC 값을 수평 점선으로 표시 → 구역 간 차이 시각화
-    for zone_name, (x0, x1) in zip(
-        ["Center", "Mid", "Edge"],
-        [(0, radius * _CENTER_RATIO),
-         (radius * _CENTER_RATIO, radius * _MID_RATIO),
-         (radius * _MID_RATIO, radius)],
-    ):
+    for zone_name, x0, x1 in zone_bounds:
         zone_mean = zone_stats[zone_name]["mean"]
         if not np.isnan(zone_mean):
-            fig.add_shape(
+            shapes.append(dict(
                 type="line",
                 x0=x0, x1=x1,
                 y0=zone_mean, y1=zone_mean,
@@ -394,9 +697,9 @@ def create_gpc_radial_profile(
                     dash="dot",
                 ),
                 layer="above",
-            )
+            ))
             # 구역 평균값 텍스트 라벨 (수평선 오른쪽 끝에 표시)
-            fig.add_annotation(
+            annotations.append(dict(
                 x=x1,
                 y=zone_mean,
                 text=f"μ={zone_mean:.3f}",
@@ -406,21 +709,28 @@ def create_gpc_radial_profile(
                 bgcolor="rgba(255,255,255,0.7)",
                 xref="x",
                 yref="y",
-            )
-
-    # ── 웨이퍼 경계 수직선 ───────────────────────────────────────────────────
-    fig.add_vline(
-        x=radius,
-        line_dash="dash",
-        line_color="black",
-        line_width=1.5,
-        annotation_text=f"Edge ({radius:.1f} mm)",
-        annotation_position="top right",
-        annotation_font=dict(size=9),
-    )
+            ))
+
+    # ── 웨이퍼 경계 수직선 (add_vline과 같은 line shape + 우상단 라벨) ─────────
+    shapes.append(dict(
+        type="line",
+        x0=radius, x1=radius, xref="x",
+        y0=0, y1=1, yref="y domain",
+        line=dict(color="black", dash="dash", width=1.5),
+    ))
+    annotations.append(dict(
+        text=f"Edge ({radius:.1f} mm)",
+        x=radius, xref="x", xanchor="left",
+        y=1, yref="y domain", yanchor="top",
+        showarrow=False,
+        font=dict(size=9),
+    ))
 
-    # ── 레이아웃 ─────────────────────────────────────────────────────────────
+    # ── Figure 1회 생성 (trace + 도형 + 주석 + 레이아웃) ──────────────────────
+    fig = go.Figure(data=traces)
     fig.update_layout(
+        shapes=shapes,
+        annotations=annotations,
         title=dict(text="반경별 GPC 프로파일", x=0.5, font=dict(size=14)),
         xaxis=dict(
             title="반경 (mm)",
@@ -454,10 +764,10 @@ def create_gpc_radial_profile(
 # [함수 3] create_gpc_uniformity_summary
 # =============================================================================
 
-@st.cache_data
 def create_gpc_uniformity_summary(
-    df_json: str,
+    df_blob: bytes,
     unit: str = "Å/cycle",
+    fp: str = None,
 ) -> go.Figure:
     """
     구역별(Center/Mid/Edge) GPC 박스플롯 + 전체 평균 기준선.
@@ -471,27 +781,30 @@ def create_gpc_uniformity_summary(
     [3구역 go.Box trace 구성]
     각 구역을 별도 go.Box trace로 → 색상/레이블 개별 지정 가능
     boxmean=True: 박스 내부에 평균 기호(◇) 추가 → 중위수와 차이 시각화
+    사분위수·수염(1.5×IQR)은 _box_stats로 사전 계산 → 원본 배열 대신 통계값만 전송
+    이상치는 투명 Box trace의 점으로 겹쳐 표시 (기존 boxpoints="outliers"와 동일 모양)
 
     인자:
-        df_json: "x","y","data"(=GPC) 컬럼의 JSON
+        df_blob: "x","y","data"(=GPC) 컬럼의 Arrow IPC blob
         unit   : GPC 단위 표기 (Y축 라벨)
+        fp     : blob_fingerprint 결과 (없으면 여기서 계산)
 
     반환:
         go.Figure: 구역별 GPC 박스플롯 Figure
+        ⚠️ cache_resource 공유 객체 → 수정 필요 시 go.Figure(fig)로 복사 후 사용
     """
-    df = pd.read_json(df_json)
+    fp = fp or blob_fingerprint(df_blob)
+    return _uniformity_summary_by_fp(fp, unit, df_blob)
 
-    # ── 반경 계산 및 구역 분류 ────────────────────────────────────────────────
-    df["r"]    = np.sqrt(df["x"] ** 2 + df["y"] ** 2)
-    radius     = df["r"].max()
-    gpc_vals   = df["data"].values
-    r_vals     = df["r"].values
 
-    zone_stats = _compute_zone_stats(r_vals, gpc_vals, radius)
+@st.cache_resource(show_spinner=False, max_entries=_FIG_CACHE_MAX)
+def _uniformity_summary_by_fp(fp: str, unit: str, _df_blob: bytes) -> go.Figure:
+    """create_gpc_uniformity_summary 본체. 캐시 키 = (fp, unit)."""
+    # ── 반경 계산 및 구역 분류 (프로파일과 같은 캐시 항목 공유) ────────────────
+    zone_stats = _prepare_gpc_arrays(_df_blob, fp)[3]
 
-    # ── 전체 평균 GPC (기준선용) ─────────────────────────────────────────────
-    valid_gpc  = gpc_vals[~np.isnan(gpc_vals)]
-    global_mean = float(np.nanmean(valid_gpc)) if len(valid_gpc) > 0 else np.nan
+    # ── 전체 평균 GPC (기준선용): 구역 통계와 같은 패스에서 합성된 값 ──────────
+    global_mean = zone_stats["All"]["mean"]
 
     # ── Figure 생성: 구역별 go.Box trace ────────────────────────────────────
     fig = go.Figure()
@@ -508,7 +821,7 @@ def create_gpc_uniformity_summary(
         "Edge":   _ZONE_LINE_COLORS["Edge"],
     }
 
-    for zone_name in ["Center", "Mid", "Edge"]:
+    for zone_name in _ZONE_NAMES:
         zone_data  = zone_stats[zone_name]["data"]
         zone_count = zone_stats[zone_name]["count"]
 
@@ -516,26 +829,44 @@ def create_gpc_uniformity_summary(
             # 해당 구역에 데이터 없으면 빈 trace (레이아웃 일관성 유지)
             continue
 
+        # 사분위수/수염/이상치는 서버에서 계산 → 원본 구역 배열 전체 대신 통계값 + 이상치만 전송
+        # (대형 웨이퍼에서 Figure 페이로드와 브라우저 사분위 계산 제거)
+        label = f"{zone_name}<br><sub>({zone_count}pts)</sub>"
+        q1, med, q3, lo_fence, up_fence, outliers = _box_stats(zone_data)
         fig.add_trace(go.Box(
-            y=zone_data,
-            name=f"{zone_name}<br><sub>({zone_count}pts)</sub>",
+            x=[label],
+            q1=[q1], median=[med], q3=[q3],
+            lowerfence=[lo_fence], upperfence=[up_fence],
+            mean=[zone_stats[zone_name]["mean"]],
             boxmean=True,           # 박스 내부에 평균(◇) 표시
-            boxpoints="outliers",   # 이상치 점만 표시 (모든 점은 너무 많음)
-            jitter=0.3,             # 이상치 점들이 겹치지 않도록 가로로 분산
-            pointpos=0,             # 이상치 점 위치: 박스 중앙
-            marker=dict(
-                color=box_colors[zone_name],
-                size=4,
-                opacity=0.7,
-                line=dict(width=0.5, color="white"),
-            ),
+            name=label,
             fillcolor=box_colors[zone_name],
             line=dict(color=box_line_colors[zone_name], width=1.5),
-            hovertemplate=(
-                f"<b>{zone_name} Zone</b><br>"
-                f"GPC: %{{y:.4f}} {unit}<extra></extra>"
-            ),
         ))
+        if outliers.size > 0:
+            # 사전 계산 Box는 표본 점을 그리지 않음 → 이상치만 담은 투명 Box를 겹쳐 점으로 표시
+            # (boxpoints="all" + jitter로 기존 boxpoints="outliers"와 같은 모양)
+            # x 생략 → trace name이 박스 위치 (라벨 문자열을 이상치 개수만큼 반복 전송하지 않음)
+            fig.add_trace(go.Box(
+                y=outliers.astype(_TRACE_DTYPE),
+                name=label,
+                boxpoints="all",        # 이 trace의 점 = 이상치 전체
+                jitter=0.3,             # 이상치 점들이 겹치지 않도록 가로로 분산
+                pointpos=0,             # 이상치 점 위치: 박스 중앙
+                fillcolor="rgba(0,0,0,0)",
+                line=dict(width=0),     # 이상치로 계산된 박스 자체는 숨김
+                hoveron="points",
+                marker=dict(
+                    color=box_colors[zone_name],
+                    size=4,
+                    opacity=0.7,
+                    line=dict(width=0.5, color="white"),
+                ),
+                hovertemplate=(
+                    f"<b>{zone_name} Zone</b><br>"
+                    f"GPC: %{{y:.4f}} {unit}<extra></extra>"
+                ),
+            ))
 
     # ── 전체 평균 기준선 ─────────────────────────────────────────────────────
     if not np.isnan(global_mean):
@@ -569,6 +900,69 @@ def create_gpc_uniformity_summary(
     return fig
 
 
+def _gpc_heatmap(gpc_blob: bytes, resolution: int, colorscale: str,
+                 unit: str, fp: str = None) -> go.Figure:
+    """
+    컬러바 제목이 GPC 단위인 표시용 Heatmap (create_2d_heatmap 재사용).
+    ⚠️ cache_resource 공유 객체 → 수정 필요 시 go.Figure(fig)로 복사 후 사용
+    """
+    fp = fp or blob_fingerprint(gpc_blob)
+    return _gpc_heatmap_by_fp(fp, resolution, colorscale, unit, gpc_blob)
+
+
+@st.cache_resource(show_spinner=False, max_entries=_FIG_CACHE_MAX)
+def _gpc_heatmap_by_fp(fp: str, resolution: int, colorscale: str,
+                       unit: str, _gpc_blob: bytes) -> go.Figure:
+    """
+    _gpc_heatmap 본체. 캐시 키 = (fp, resolution, colorscale, unit).
+    create_2d_heatmap 반환값은 공유 객체 → 복사 후 컬러바 수정을 캐시 미스 때 1회만 수행
+    (매 rerun Figure 전체 복사 + 재검증 제거, st.plotly_chart에는 검증된 Figure 그대로 전달)
+    """
+    fig = go.Figure(create_2d_heatmap(
+        df_blob=_gpc_blob,
+        resolution=resolution,
+        colorscale=colorscale,
+        show_points=False,    # GPC 맵에서 측정점은 오히려 가독성 저하
+        fp=fp,
+    ))
+    fig.data[0].colorbar.title = dict(text=unit, side="right")
+    return fig
+
+
+def _gpc_csv_bytes(gpc_blob: bytes, unit: str, fp: str = None) -> bytes:
+    """GPC 다운로드 CSV (x, y, GPC, r_mm) UTF-8 bytes."""
+    fp = fp or blob_fingerprint(gpc_blob)
+    return _gpc_csv_by_fp(fp, unit, gpc_blob)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _gpc_csv_by_fp(fp: str, unit: str, _gpc_blob: bytes) -> bytes:
+    """
+    다운로드 버튼 data는 클릭 여부와 무관하게 rerun마다 전달됨
+    → to_csv 인코딩을 (GPC blob, 단위) 조합당 1회로 제한.
+    float_format="%.6g": 유효숫자 6자리 (측정 정밀도 이상) → 파일 크기 약 절반, 인코딩도 더 빠름
+    """
+    df = blob_to_df(_gpc_blob)
+    df = df.rename(columns={"data": f"GPC_{unit.replace('/', '_per_')}"})
+    df["r_mm"] = np.round(_prepare_gpc_arrays(_gpc_blob, fp)[0], 4)
+    return df.to_csv(index=False, float_format="%.6g").encode("utf-8")
+
+
+def _box_stats(data: np.ndarray) -> tuple:
+    """
+    Plotly 박스플롯 기본값과 같은 요약 통계: (q1, median, q3, lowerfence, upperfence, outliers).
+    사분위수 = plotly.js Lib.interp(정렬값, p) 규칙: 위치 p·n - 0.5 선형 보간, 양 끝 고정
+    (Plotly quartilemethod="linear" = np.quantile method="hazen", numpy 기본 "linear"와 다름)
+    수염 = [q1 - 1.5·IQR, q3 + 1.5·IQR] 안의 최소/최대 데이터, 그 밖의 점 = 이상치
+    """
+    q1, med, q3 = np.quantile(data, (0.25, 0.5, 0.75), method="hazen")
+    iqr = q3 - q1
+    inside = (data >= q1 - 1.5 * iqr) & (data <= q3 + 1.5 * iqr)
+    in_data = data[inside]
+    return (float(q1), float(med), float(q3),
+            float(in_data.min()), float(in_data.max()), data[~inside])
+
+
 # =============================================================================
 # [함수 4] render_gpc_tab (UI 렌더러)
 # =============================================================================
@@ -578,6 +972,7 @@ def render_gpc_tab(
     all_cols: list,
     resolution: int,
     colorscale: str,
+    df_key=None,
 ) -> None:
     """
     GPC 분석 탭의 전체 UI를 렌더링.
@@ -598,17 +993,18 @@ def render_gpc_tab(
     └──────────────────────────┴──────────────────────────┘
 
     [핵심 데이터 흐름]
-    df_raw → compute_gpc_column() → gpc_df_json (str)
-    gpc_df_json → create_2d_heatmap()        → GPC Heatmap Figure
-    gpc_df_json → create_gpc_radial_profile() → 반경별 프로파일 Figure
-    gpc_df_json → create_gpc_uniformity_summary() → 박스플롯 Figure
-    gpc_df_json → calculate_stats()          → 통계 dict
+    df_raw → compute_gpc_column() → gpc_blob (bytes)
+    gpc_blob → create_2d_heatmap()        → GPC Heatmap Figure
+    gpc_blob → create_gpc_radial_profile() → 반경별 프로파일 Figure
+    gpc_blob → create_gpc_uniformity_summary() → 박스플롯 Figure
+    gpc_blob → calculate_stats()          → 통계 dict
 
     인자:
         df_raw     : 원본 DataFrame (파일 로딩 직후 상태)
         all_cols   : df_raw의 전체 컬럼명 리스트
         resolution : 보간 해상도 (사이드바 슬라이더)
         colorscale : 컬러스케일 이름 (사이드바 selectbox)
+        df_key     : df_raw 내용 식별 키 (app의 shared_df_raw_key, 없으면 전체 행 해시)
     """
     # ── 컨트롤 패널 + 요약 지표 (2컬럼 레이아웃) ─────────────────────────────
     col_ctrl, col_summary = st.columns([1, 2])
@@ -746,22 +1142,21 @@ def render_gpc_tab(
         )
 
     # ── GPC 계산 실행 ─────────────────────────────────────────────────────────
-    # compute_gpc_column 호출 전 df_raw를 JSON으로 변환
-    # (all_cols 전체를 포함하는 원본 df → 컬럼 선택은 함수 내부)
-    df_raw_json = df_raw.to_json()
-
+    # all_cols 전체를 포함하는 원본 df 그대로 전달 → 컬럼 선택은 함수 내부
     # ★ compute_gpc_column: @st.cache_data 적용 → 동일 인자이면 재계산 없음
-    gpc_df_json = compute_gpc_column(
-        df_json=df_raw_json,
+    #   df_key 전달 시 원본 전체 행 해시 없이 캐시 조회 (슬라이더 rerun마다 재해싱 방지)
+    gpc_blob = compute_gpc_column(
+        df_raw=df_raw,
         x_col=x_col_sel,
         y_col=y_col_sel,
         thickness_col=thickness_col,
         cycle_mode=cycle_mode,
         cycle_col=cycle_col,
         fixed_cycles=fixed_cycles,
+        df_key=df_key,
     )
 
-    if gpc_df_json is None:
+    if gpc_blob is None:
         st.error(
             "❌ GPC 계산에 실패했습니다.\n\n"
             "가능한 원인:\n"
@@ -772,20 +1167,21 @@ def render_gpc_tab(
         st.session_state["gpc_result"] = None
         return
 
+    # ── blob fingerprint 1회 계산 → 하위 캐시 함수 전체의 키로 공유 ──────────
+    # (통계/Heatmap/프로파일/박스플롯/구역 통계가 각자 blob 전체를 재해싱하지 않음)
+    gpc_fp = blob_fingerprint(gpc_blob)
+
     # ── 통계 계산 (계산 후 즉시 요약 지표 표시) ──────────────────────────────
-    # calculate_stats: @st.cache_data 적용 → gpc_df_json 동일하면 캐시 히트
-    stats = calculate_stats(gpc_df_json)
+    # calculate_stats: fp 키 캐시 → gpc_blob 동일하면 캐시 히트
+    stats = calculate_stats(gpc_blob, fp=gpc_fp)
 
-    fig_gpc_heatmap = create_2d_heatmap(
-        df_json=gpc_df_json,
-        resolution=resolution,
-        colorscale=colorscale,
-        show_points=False,
-    )
+    # GPC Heatmap 1회 조회 → 보고서용 session_state와 아래 Heatmap 패널이 같은 객체 공유
+    # (컬러바 단위까지 반영된 cache_resource Figure, 캐시 조회/복사 중복 없음)
+    fig_gpc_heatmap = _gpc_heatmap(gpc_blob, resolution, colorscale, unit, gpc_fp)
     st.session_state["gpc_result"] = {
         "stats": stats,
         "heatmap_fig": fig_gpc_heatmap,
-        "df_json": gpc_df_json,
+        "df_blob": gpc_blob,
     }
 
     with col_summary:
@@ -804,16 +1200,8 @@ def render_gpc_tab(
             unif_grade, unif_color = "N/A", "off"
 
         # 구역별 통계 (Center-Edge 편차 계산용)
-        gpc_df_for_zone = pd.read_json(gpc_df_json)
-        gpc_df_for_zone["r"] = np.sqrt(
-            gpc_df_for_zone["x"] ** 2 + gpc_df_for_zone["y"] ** 2
-        )
-        radius_val = gpc_df_for_zone["r"].max()
-        zone_stats = _compute_zone_stats(
-            gpc_df_for_zone["r"].values,
-            gpc_df_for_zone["data"].values,
-            radius_val,
-        )
+        # _prepare_gpc_arrays: 프로파일/박스플롯과 같은 캐시 항목 → 반경·구역 재계산 없음
+        zone_stats = _prepare_gpc_arrays(gpc_blob, gpc_fp)[3]
 
         center_mean = zone_stats["Center"]["mean"]
         edge_mean   = zone_stats["Edge"]["mean"]
@@ -855,24 +1243,18 @@ def render_gpc_tab(
 
     with row1_left:
         st.markdown("##### 🗺️ GPC Heatmap")
-        # ★ create_2d_heatmap 재사용: gpc_df_json의 "data" 컬럼 = GPC 값
+        # ★ create_2d_heatmap 재사용: gpc_blob의 "data" 컬럼 = GPC 값
         #   compute_gpc_column이 "x","y","data" 구조를 반환하므로 바로 전달 가능
-        fig_heatmap = create_2d_heatmap(
-            df_json=gpc_df_json,
-            resolution=resolution,
-            colorscale=colorscale,
-            show_points=False,    # GPC 맵에서 측정점은 오히려 가독성 저하
-        )
-        # 컬러바 제목을 단위로 업데이트
-        fig_heatmap.data[0].colorbar.title = dict(text=unit, side="right")
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        # 컬러바 제목(단위)까지 반영된 Figure (위에서 조회한 객체 재사용)
+        st.plotly_chart(fig_gpc_heatmap, use_container_width=True)
 
     with row1_right:
         st.markdown("##### 📈 반경별 GPC 프로파일")
         fig_radial = create_gpc_radial_profile(
-            df_json=gpc_df_json,
+            df_blob=gpc_blob,
             window=smooth_window,
             unit=unit,
+            fp=gpc_fp,
         )
         st.plotly_chart(fig_radial, use_container_width=True)
 
@@ -882,8 +1264,9 @@ def render_gpc_tab(
     with row2_left:
         st.markdown("##### 📦 구역별 GPC 분포 (박스플롯)")
         fig_box = create_gpc_uniformity_summary(
-            df_json=gpc_df_json,
+            df_blob=gpc_blob,
             unit=unit,
+            fp=gpc_fp,
         )
         st.plotly_chart(fig_box, use_container_width=True)
 
@@ -900,7 +1283,7 @@ def render_gpc_tab(
         # 구역별 통계 테이블
         st.markdown("**구역별 GPC 통계:**")
         zone_rows = []
-        for zone_name in ["Center", "Mid", "Edge"]:
+        for zone_name in _ZONE_NAMES:
             zs = zone_stats[zone_name]
             zone_rows.append({
                 "구역":       zone_name,
@@ -915,15 +1298,9 @@ def render_gpc_tab(
         )
 
         # ── GPC 데이터 CSV 다운로드 버튼 ─────────────────────────────────────
-        gpc_download_df = pd.read_json(gpc_df_json)
-        gpc_download_df = gpc_download_df.rename(columns={"data": f"GPC_{unit.replace('/', '_per_')}"})
-        gpc_download_df["r_mm"] = np.sqrt(
-            gpc_download_df["x"] ** 2 + gpc_download_df["y"] ** 2
-        ).round(4)
-
         st.download_button(
             label=f"📥 GPC 데이터 CSV 다운로드",
-            data=gpc_download_df.to_csv(index=False),
+            data=_gpc_csv_bytes(gpc_blob, unit, gpc_fp),
             file_name="gpc_data.csv",
             mime="text/csv",
             key="gpc_download_btn",
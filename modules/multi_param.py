@@ -34,11 +34,12 @@
 #    make_subplots에서 col=2 이상은 "xaxis2", "yaxis2" 등 동적 키 필요.
 #    → update_layout(**{f"xaxis{suffix}": ...}) 패턴으로 로컬 구현.
 #
-# ⑤ sub_json 생성 공식 통일 (캐시 키 충돌 방지)
+# ⑤ sub_df 생성 공식 통일 (캐시 키 충돌 방지)
 #    create_multi_param_subplots 내부와 render_multi_param_tab(통계 계산부)에서
-#    sub_json을 생성하는 방식이 완전히 동일해야 get_wafer_grid 하위 캐시가 히트됨.
-#    공식: df[[x, y, param]].rename(...).dropna().reset_index(drop=True).to_json()
-#    순서가 조금이라도 달라지면 JSON 문자열이 달라져 캐시 미스 발생 → 성능 저하.
+#    sub_df를 생성하는 방식이 완전히 동일해야 get_wafer_grid 하위 캐시가 히트됨.
+#    공식: df[[x, y, param]].rename(...).dropna().reset_index(drop=True)
+#    sub_df는 직렬화 없이 core 함수에 그대로 전달 (캐시 키 = 컬럼 값 fingerprint)
+#    상위 캐시 인자 df_json은 Arrow IPC blob (core.df_to_blob) → JSON 인코딩/파싱 없음
 # =============================================================================
 
 # ── 표준 라이브러리 ─────────────────────────────────────────────────────────
@@ -51,13 +52,14 @@ import plotly.graph_objects as go
 import streamlit as st
 from plotly.subplots import make_subplots
 
-# ── wafer_app_global 핵심 함수 import ────────────────────────────────────────
+# ── core 핵심 함수 import ─────────────────────────────────────────────────
 # 주의: _wafer_layout, add_wafer_outline은 설계 이유 ①④에 의해 여기서 사용 불가.
 #       대신 아래 로컬 헬퍼(_add_outline_to_subplot, _apply_subplot_axes) 사용.
-from app import _default_col_index  # 컬럼 기본값 탐색 (이름 매칭 실패 시 fallback 인덱스 반환)
-from app import \
+from core import _default_col_index  # 컬럼 기본값 탐색 (이름 매칭 실패 시 fallback 인덱스 반환)
+from core import blob_to_df, df_to_blob  # DataFrame ↔ Arrow IPC blob
+from core import \
     calculate_stats  # 통계 계산: Mean, Std, Uniformity(%), Range, No.Sites
-from app import get_wafer_grid  # 불규칙 산점 → 균일 그리드 보간 (@st.cache_data 적용됨)
+from core import get_wafer_grid  # 불규칙 산점 → 균일 그리드 보간 (@st.cache_resource 적용됨, 읽기 전용 배열)
 
 # =============================================================================
 # session_state 키 상수 (prefix: "mp_")
@@ -240,7 +242,7 @@ def _apply_subplot_axes(
 
 @st.cache_data
 def create_multi_param_subplots(
-    df_json: str,
+    df_json: bytes,
     x_col: str,
     y_col: str,
     param_cols: tuple,     # ★ tuple 필수: list는 hash() 불가 → @st.cache_data TypeError
@@ -257,7 +259,7 @@ def create_multi_param_subplots(
     - df 편집 → df_json 달라짐 → 자동 캐시 갱신
     - resolution, colorscale 변경 → 자동 캐시 갱신
     ★ 모든 인자가 hashable 타입임을 보장해야 @st.cache_data 정상 동작:
-      df_json    : str ✅
+      df_json    : bytes (Arrow IPC blob) ✅
       x_col      : str ✅
       y_col      : str ✅
       param_cols : tuple (list 불가) ✅
@@ -267,8 +269,8 @@ def create_multi_param_subplots(
 
     [2단계 캐시 전략]
     이 함수(상위 캐시) 미스 시:
-      → get_wafer_grid(sub_json, resolution) 호출 (하위 캐시)
-      → 하위 캐시가 이전에 동일 sub_json으로 호출된 적 있으면 히트
+      → get_wafer_grid(sub_df, resolution) 호출 (하위 캐시)
+      → 하위 캐시가 이전에 동일 값의 sub_df로 호출된 적 있으면 히트
       → 파라미터 1개만 추가/제거해도 나머지 파라미터는 하위 캐시 히트 → 재보간 없음
 
     [share_scale 동작]
@@ -291,10 +293,10 @@ def create_multi_param_subplots(
     반환:
         go.Figure: make_subplots로 구성된 1행 N열 Heatmap Figure
     """
-    # ── 캐시 함수 진입: df_json 역직렬화 ─────────────────────────────────────
-    # @st.cache_data 적용 함수는 DataFrame을 인자로 받을 수 없으므로
-    # 항상 함수 진입 즉시 pd.read_json()으로 복원
-    df = pd.read_json(df_json)
+    # ── 캐시 함수 진입: df_json(Arrow IPC blob) 역직렬화 ────────────────────
+    # @st.cache_data 인자 해싱 비용을 줄이기 위해 bytes로 전달받고
+    # 함수 진입 즉시 blob_to_df()로 복원 (텍스트 파싱/타입 추론 없음)
+    df = blob_to_df(df_json)
     n  = len(param_cols)  # subplot 컬럼 수
 
     # ── subplot 간격 계산: 파라미터 수가 많을수록 좁게 ──────────────────────
@@ -334,20 +336,19 @@ def create_multi_param_subplots(
         # ── 파라미터별 표준 sub_df 생성 ─────────────────────────────────────
         # ★ 주의: 이 공식은 render_multi_param_tab의 calculate_stats 호출부와
         #   반드시 동일해야 get_wafer_grid 하위 캐시가 히트됨.
-        # 순서 통일: [[x,y,param]] → rename → dropna → reset_index → to_json
-        # 순서가 조금이라도 달라지면 JSON 문자열이 달라져 캐시 미스 발생.
+        # 순서 통일: [[x,y,param]] → rename → dropna → reset_index
+        # 캐시 키 = x/y/data 컬럼 값 fingerprint → 값이 같으면 캐시 히트.
         sub_df = (
             df[[x_col, y_col, param_col]]
             .rename(columns={x_col: "x", y_col: "y", param_col: "data"})
             .dropna()
             .reset_index(drop=True)
         )
-        sub_json = sub_df.to_json()
 
         # ── 그리드 보간 (2단계 캐시의 하위 캐시 활용) ───────────────────────
-        # get_wafer_grid는 wafer_app_global에서 @st.cache_data 적용됨.
-        # sub_json이 이전과 같으면 → 캐시 히트 → 재보간 없음 (성능↑)
-        XI, YI, ZI, radius = get_wafer_grid(sub_json, resolution)
+        # get_wafer_grid는 core에서 (fingerprint, resolution) 키로 캐시됨.
+        # sub_df를 직렬화 없이 그대로 전달 → 값이 이전과 같으면 캐시 히트
+        xi, yi, ZI, radius = get_wafer_grid(sub_df, resolution)
 
         # ── colorbar 설정 결정 ───────────────────────────────────────────────
         if share_scale:
@@ -380,14 +381,13 @@ def create_multi_param_subplots(
 
         # ── Heatmap trace 추가 ───────────────────────────────────────────────
         # row=1, col=i: 1행 i열 subplot에 정확히 배치 (필수)
-        # XI[0]   : x축 좌표 벡터 (모든 행에서 x값이 동일 → 첫 행만 추출)
-        # YI[:,0] : y축 좌표 벡터 (모든 열에서 y값이 동일 → 첫 열만 추출)
+        # xi, yi  : get_wafer_grid가 반환하는 1D 축 좌표 벡터 (그대로 전달)
         # zsmooth="best": 보간 그리드를 추가 스무딩 → 시각적 품질 향상
         # connectgaps=False: NaN(원 밖 마스크 영역)을 투명으로 유지
         fig.add_trace(
             go.Heatmap(
-                x=XI[0],
-                y=YI[:, 0],
+                x=xi,
+                y=yi,
                 z=ZI,
                 colorscale=colorscale,
                 zsmooth="best",
@@ -451,7 +451,7 @@ def render_multi_param_tab(
     resolution: int,
     colorscale: str,
 ) -> None:
-    df_raw = pd.read_json(df_json)
+    df_raw = blob_to_df(df_json)
     """
     다중 파라미터 서브플롯 탭의 전체 UI를 렌더링.
 
@@ -592,10 +592,10 @@ def render_multi_param_tab(
         )
         return
 
-    # df_json 생성: 선택된 컬럼만 포함한 서브셋을 JSON으로 직렬화
+    # df_json 생성: 선택된 컬럼만 포함한 서브셋을 Arrow IPC blob으로 직렬화
     # create_multi_param_subplots 내부에서 sub_df를 추출하므로
     # 여기서는 전체 서브셋을 전달 (컬럼 선택은 함수 내부에서 처리)
-    df_json = df_subset.to_json()
+    df_json = df_to_blob(df_subset)
 
     # ── param_cols tuple 변환 ─────────────────────────────────────────────────
     # ★ 반드시 tuple로 변환: st.multiselect는 list를 반환하나
@@ -621,20 +621,19 @@ def render_multi_param_tab(
     metric_cols = st.columns(len(sel_params))
 
     for metric_col_widget, param_col in zip(metric_cols, sel_params):
-        # ★ sub_json을 create_multi_param_subplots 내부와 완전히 동일한 방식으로 생성
+        # ★ sub_df를 create_multi_param_subplots 내부와 완전히 동일한 방식으로 생성
         #   이 공식이 달라지면 get_wafer_grid / calculate_stats 캐시 미스 발생
-        #   공식: [[x,y,param]] → rename → dropna → reset_index → to_json
+        #   공식: [[x,y,param]] → rename → dropna → reset_index
         sub_df = (
             df_subset[[sel_x, sel_y, param_col]]
             .rename(columns={sel_x: "x", sel_y: "y", param_col: "data"})
             .dropna()
             .reset_index(drop=True)
         )
-        sub_json = sub_df.to_json()
 
         # calculate_stats: @st.cache_data 적용됨
-        # → sub_json이 create 함수 내부와 동일 → 캐시 히트 → 0 계산 비용
-        stats = calculate_stats(sub_json)
+        # → sub_df 값이 create 함수 내부와 동일 → 캐시 히트 → 0 계산 비용
+        stats = calculate_stats(sub_df)
 
         uniformity = stats.get("Uniformity (%)", float("nan"))
         mean_val   = stats.get("Mean",           float("nan"))